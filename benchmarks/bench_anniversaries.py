@@ -0,0 +1,83 @@
+"""纪念日匹配性能基准。
+
+以 1 万条纪念日配置，对比哈希索引与逐条规则扫描两种方式下
+get_festival_info 的耗时。
+
+运行方式（项目根目录）：
+
+    python benchmarks/bench_anniversaries.py
+"""
+
+import datetime
+import os
+import random
+import sys
+import tempfile
+import timeit
+
+sys.path.append(
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "../custom_components/jdm_holiday")
+    )
+)
+
+import holiday_engine
+from holiday_engine import AnniversaryIndex, Holiday
+
+
+class LinearIndex(AnniversaryIndex):
+    """逐条扫描规则的对照实现。"""
+
+    def match(self, date, lunar):
+        return [
+            rule.name for rule in self.rules
+            if lunar is not None or not rule.is_lunar
+            if rule.matches(date, lunar)
+        ]
+
+
+def make_anniversaries(count: int) -> dict:
+    rng = random.Random(0)
+    data = {}
+    while len(data) < count:
+        month = rng.randint(1, 12)
+        day = rng.randint(1, 28)
+        kind = rng.randrange(4)
+        if kind == 0:
+            key = "{:0>2d}-{:0>2d}".format(month, day)
+        elif kind == 1:
+            key = "{}-{:0>2d}-{:0>2d}".format(rng.randint(2020, 2030), month, day)
+        elif kind == 2:
+            key = "n{:0>2d}-{:0>2d}".format(month, day)
+        else:
+            key = "n{}-{:0>2d}-{:0>2d}".format(
+                rng.randint(1950, 2030), month, day)
+        data[key] = "纪念日{}".format(len(data))
+    return data
+
+
+def main(count: int = 10_000, days: int = 365) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        holiday_engine.HOLIDAY_DB_FILE = os.path.join(tmp, "data.db")
+        holiday_engine.HOLIDAY_DATA_FILE = os.path.join(tmp, "holiday.json")
+        engine = Holiday(make_anniversaries(count))
+
+        start = datetime.datetime(2026, 1, 1)
+        dates = [start + datetime.timedelta(days=i) for i in range(days)]
+
+        def run():
+            for date in dates:
+                engine.get_festival_info(date)
+
+        indexed = timeit.timeit(run, number=1)
+        engine._anniversary_index = LinearIndex(engine._anniversary_index.rules)
+        linear = timeit.timeit(run, number=1)
+
+    print("纪念日数量: {}，查询天数: {}".format(count, days))
+    print("逐条扫描: {:.3f} ms/天".format(linear / days * 1000))
+    print("哈希索引: {:.3f} ms/天".format(indexed / days * 1000))
+    print("加速比: {:.1f}x".format(linear / indexed))
+
+
+if __name__ == "__main__":
+    main()
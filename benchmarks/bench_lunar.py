@@ -0,0 +1,44 @@
+"""农历转换性能基准。
+
+对比逐日查找表与按年/月遍历（_fromOffset）两种公历转农历实现。
+
+运行方式（项目根目录）：
+
+    python benchmarks/bench_lunar.py
+"""
+
+import os
+import random
+import sys
+import timeit
+
+sys.path.append(
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "../custom_components/jdm_holiday")
+    )
+)
+
+from holiday_engine import Info, LunarDate
+
+
+def main(number: int = 100_000) -> None:
+    total = Info.yearOffsets[-1]
+    rng = random.Random(0)
+    offsets = [rng.randrange(total) for _ in range(number)]
+
+    build = timeit.timeit(LunarDate._buildDayTable, number=5) / 5
+    print("生成查找表: {:.2f} ms ({} 项)".format(build * 1000, total))
+
+    LunarDate._getDayTable()
+    walk = timeit.timeit(
+        lambda: [LunarDate._fromOffset(o) for o in offsets], number=1)
+    table = timeit.timeit(
+        lambda: [LunarDate._fromTable(o) for o in offsets], number=1)
+
+    print("_fromOffset 遍历: {:.3f} us/次".format(walk / number * 1e6))
+    print("_fromTable 查表: {:.3f} us/次".format(table / number * 1e6))
+    print("加速比: {:.2f}x".format(walk / table))
+
+
+if __name__ == "__main__":
+    main()
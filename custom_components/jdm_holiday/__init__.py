@@ -4,16 +4,19 @@
 以及注册相应的传感器平台（Sensor 和 Binary Sensor）。
 """
 
+import functools
 import logging
 import voluptuous as vol
 
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.discovery import async_load_platform
 from homeassistant.helpers.typing import ConfigType
 
 from .const import DOMAIN
 from .holiday_engine import Holiday
+from .storage import async_create_store
 
 # 获取当前模块的日志记录器
 _LOGGER = logging.getLogger(__name__)
@@ -23,7 +26,15 @@ _LOGGER = logging.getLogger(__name__)
 CONFIG_SCHEMA = vol.Schema(
     {
         DOMAIN: vol.Schema(
-            {vol.Optional("anniversaries"): vol.Schema({cv.string: cv.string})}
+            {
+                vol.Optional("anniversaries"): vol.Schema({cv.string: cv.string}),
+                # 可选的外部纪念日文件（YAML/JSON/CSV），修改后无需重启即可生效
+                vol.Optional("anniversaries_file"): cv.string,
+                # 数据存储后端：sqlite 为组件目录下的 data.db，
+                # store 为 Home Assistant 的 .storage 目录（更新组件不会丢失缓存，
+                # 但宜忌等完整字段会全部常驻内存）
+                vol.Optional("storage", default="sqlite"): vol.In(["sqlite", "store"]),
+            }
         )
     },
     extra=vol.ALLOW_EXTRA,
@@ -57,14 +68,33 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     try:
         # 获取用户配置的自定义纪念日
         anniversaries = config.get(DOMAIN, {}).get("anniversaries", {})
+        # 外部纪念日文件，相对路径基于 Home Assistant 配置目录
+        anniversaries_file = config.get(DOMAIN, {}).get("anniversaries_file")
+        if anniversaries_file:
+            anniversaries_file = hass.config.path(anniversaries_file)
+        # 使用 Store 后端时先在事件循环中异步读取数据
+        db = None
+        if config.get(DOMAIN, {}).get("storage") == "store":
+            db = await async_create_store(hass)
         # 初始化 Holiday 引擎并传递自定义纪念日
-        holiday_engine = await hass.async_add_executor_job(Holiday, anniversaries)
+        holiday_engine = await hass.async_add_executor_job(
+            functools.partial(
+                Holiday, anniversaries, anniversaries_file,
+                preload_years=1, db=db,
+            )
+        )
         # 将初始化的引擎实例存储在 hass.data 中，以便其他平台（sensor, binary_sensor）调用
         hass.data[DOMAIN]["engine"] = holiday_engine
     except Exception as e:
         _LOGGER.error("Holiday 引擎初始化失败: %s", e)
         return False
 
+    async def _async_close_db(event: Event) -> None:
+        """Home Assistant 停止时关闭数据库长连接。"""
+        await hass.async_add_executor_job(holiday_engine.db.close)
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_close_db)
+
     # 注册传感器（sensor）平台
     # 这里使用 discovery.async_load_platform 动态加载平台
     # 这意味着只要 configuration.yaml 中有 `jdm_holiday:`，这些平台就会自动加载
@@ -5,33 +5,52 @@ Holiday 模块
 
 核心逻辑：
 1. 从服务端（API）获取节假日数据。
-2. 将数据存入本地 JSON 文件进行缓存。
+2. 将数据存入本地 SQLite 数据库（或 Home Assistant Store）持久化。
 3. 提供查询接口，判断特定日期是否为节假日，或获取最近的节假日安排。
 """
 
+import csv
 import datetime
+import hashlib
+import heapq
 import json
 import logging
+import math
 import os
 import sqlite3
+import threading
 import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
 from datetime import datetime as datetime_class
 from datetime import timedelta, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from functools import lru_cache, total_ordering
+from itertools import accumulate
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
 
 import requests
 from requests.adapters import HTTPAdapter
 
+try:
+    import yaml
+except ImportError:  # PyYAML 随 Home Assistant 安装，仅读取 YAML 纪念日文件时需要
+    yaml = None
+
 _LOGGER = logging.getLogger(__name__)
 
 # 使用当前文件所在目录作为数据存储目录
 DATA_DIR = os.path.dirname(os.path.realpath(__file__))
-# JSON 缓存文件路径
+# 旧版本的 JSON 缓存，启动时导入数据库后停用
 HOLIDAY_DATA_FILE = os.path.join(DATA_DIR, "holiday.json")
 # SQLite 数据库路径
 HOLIDAY_DB_FILE = os.path.join(DATA_DIR, "data.db")
+# 随组件发布的国务院节假日安排，首次启动无需联网即可判断节假日
+HOLIDAY_SEED_FILE = os.path.join(DATA_DIR, "holiday_seed.json")
 # API 地址
 API_URL = "http://tool.bitefu.net/jiari/"
+# 首次安装且内置数据覆盖今年时，推迟联网更新的时长
+SEED_REFRESH_DELAY = timedelta(hours=1)
 
 _SOLAR_FESTIVAL = {
     "0101": ["元旦节"],
@@ -164,7 +183,20 @@ _WEEKDAY_FESTIVAL = {
     "1144": ["感恩节"],
 }
 
-_WEEKDAY_FESTIVAL_CACHE: Dict[int, Dict[str, List[str]]] = {}
+_TIANGAN = "甲乙丙丁戊己庚辛壬癸"
+_DIZHI = "子丑寅卯辰巳午未申酉戌亥"
+_SHENGXIAO = "鼠牛虎兔龙蛇马羊猴鸡狗猪"
+_LUNAR_MONTH_NAMES = (
+    "正", "二", "三", "四", "五", "六", "七", "八", "九", "十", "冬", "腊"
+)
+_LUNAR_DAY_NAMES = (
+    "初一", "初二", "初三", "初四", "初五", "初六", "初七", "初八", "初九", "初十",
+    "十一", "十二", "十三", "十四", "十五", "十六", "十七", "十八", "十九", "二十",
+    "廿一", "廿二", "廿三", "廿四", "廿五", "廿六", "廿七", "廿八", "廿九", "三十",
+)
+
+# 可由本地农历算法计算的日期详情字段，无需从 API 获取或存储
+_LOCAL_DETAIL_FIELDS = ("yearname", "shengxiao", "nonglicn", "nongli")
 
 
 def _festival_handle(params: Dict[str, List[str]], month: int, day: int) -> List[str]:
@@ -172,9 +204,48 @@ def _festival_handle(params: Dict[str, List[str]], month: int, day: int) -> List
     return params.get(key, [])
 
 
-def _build_weekday_festival(year: int) -> Dict[str, List[str]]:
-    if year in _WEEKDAY_FESTIVAL_CACHE:
-        return _WEEKDAY_FESTIVAL_CACHE[year]
+# 纪念日文件尚未检查过的标记，与“文件不存在”(None) 区分
+_MTIME_UNCHECKED = object()
+
+
+class _YearCache:
+    """按年缓存派生数据的缓存层。
+
+    容量有限，超出后淘汰最久未使用的年份；同一年份只会构建一次，
+    可在多个执行器线程间安全共享。
+    """
+
+    def __init__(self, builder: Callable[[int], Any], maxsize: int = 16):
+        self._builder = builder
+        self._maxsize = maxsize
+        self._data: "OrderedDict[int, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, year: int) -> Any:
+        with self._lock:
+            if year in self._data:
+                self._data.move_to_end(year)
+                return self._data[year]
+            value = self._builder(year)
+            self._data[year] = value
+            if len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+            return value
+
+    def prewarm(self, years: Iterable[int]) -> None:
+        """预先构建指定年份的数据。"""
+        for year in years:
+            try:
+                self.get(year)
+            except ValueError as e:
+                _LOGGER.debug("预热 %s 年缓存失败: %s", year, e)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+def _compute_weekday_festival(year: int) -> Dict[str, List[str]]:
     data: Dict[str, List[str]] = {}
     for key, value in _WEEKDAY_FESTIVAL.items():
         month = int(key[:2])
@@ -186,34 +257,116 @@ def _build_weekday_festival(year: int) -> Dict[str, List[str]]:
             day = day - 7
         date_key = "{:0>2d}{:0>2d}".format(month, day)
         data[date_key] = value
-    _WEEKDAY_FESTIVAL_CACHE[year] = data
     return data
 
 
+def _compute_lunar_festival(year: int) -> Dict[str, List[str]]:
+    """计算公历某年内的农历节日，返回 {MMDD: names}。
+
+    公历年内的农历节日可能属于上一个或当年的农历年；闰月不计入节日。
+    """
+    data: Dict[str, List[str]] = {}
+    for key, value in _LUNAR_FESTIVAL.items():
+        for lunar_year in (year - 1, year):
+            try:
+                d = LunarDate.toSolarDate(lunar_year, int(key[:2]), int(key[2:]))
+            except ValueError:
+                continue
+            if d.year == year:
+                data["{:0>2d}{:0>2d}".format(d.month, d.day)] = value
+    return data
+
+
+_WEEKDAY_FESTIVAL_CACHE = _YearCache(_compute_weekday_festival)
+_LUNAR_FESTIVAL_CACHE = _YearCache(_compute_lunar_festival)
+
+
+def _build_weekday_festival(year: int) -> Dict[str, List[str]]:
+    return _WEEKDAY_FESTIVAL_CACHE.get(year)
+
+
+def _build_lunar_festival(year: int) -> Dict[str, List[str]]:
+    return _LUNAR_FESTIVAL_CACHE.get(year)
+
+
+@total_ordering
 class LunarDate:
+    """农历日期（不可变值类型，可比较、可哈希，可作为字典键）。"""
+
+    __slots__ = ("year", "month", "day", "isLeapMonth")
+
     _startDate = datetime.date(1900, 1, 31)
+    _startOrdinal = _startDate.toordinal()
+
+    # 是否使用逐日查找表（首次使用时生成，约 5.5 万项，占用约 220KB）
+    useDayTable = True
+    _dayTable: Optional[array] = None
+    _dayTableLock = threading.Lock()
 
     @staticmethod
     def fromSolarDate(year, month, day):
-        solarDate = datetime.date(year, month, day)
-        offset = (solarDate - LunarDate._startDate).days
+        return LunarDate._fromOrdinal(datetime.date(year, month, day).toordinal())
+
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _fromOrdinal(ordinal):
+        """按公历序数转换，结果带 LRU 缓存，重复查询同一天时复用同一对象。"""
+        offset = ordinal - LunarDate._startOrdinal
+        if LunarDate.useDayTable:
+            return LunarDate._fromTable(offset)
         return LunarDate._fromOffset(offset)
 
+    @classmethod
+    def fromSolarRange(cls, start, end):
+        """批量将公历日期区间 [start, end]（含两端）转换为农历日期列表。
+
+        只对起始日做一次完整转换，之后按月、日计数器逐日推进，
+        避免对每一天重新计算。
+        """
+        startDate = datetime.date(start.year, start.month, start.day)
+        endDate = datetime.date(end.year, end.month, end.day)
+        startOffset = (startDate - cls._startDate).days
+        count = (endDate - startDate).days + 1
+        if count <= 0:
+            return []
+        if startOffset < 0 or startOffset + count > Info.yearOffsets[-1]:
+            raise ValueError(
+                "Date range %s ~ %s out of range" % (startDate, endDate))
+
+        first = cls._fromOffset(startOffset)
+        idx = first.year - 1900
+        months = list(cls._enumMonth(Info.yearInfos[idx]))
+        pos = months.index(
+            next(m for m in months
+                 if m[0] == first.month and m[2] == first.isLeapMonth)
+        )
+        day = first.day
+
+        result = []
+        while True:
+            month, days, isLeapMonth = months[pos]
+            while day <= days:
+                result.append(LunarDate(1900 + idx, month, day, isLeapMonth))
+                if len(result) == count:
+                    return result
+                day += 1
+            day = 1
+            pos += 1
+            if pos == len(months):
+                idx += 1
+                months = list(cls._enumMonth(Info.yearInfos[idx]))
+                pos = 0
+
     @classmethod
     def toSolarDate(cls, year, month, day, isLeapMonth=False):
         """将农历日期转换为公历日期"""
-        # 1. 计算从 1900 到目标年份之前所有年份的总天数
-        offset = 0
-        for y in range(1900, year):
-            idx = y - 1900
-            if idx < 0 or idx >= len(Info.yearInfos):
-                raise ValueError(f"Year {y} out of range")
-            offset += Info.yearInfo2yearDay(Info.yearInfos[idx])
-
-        # 2. 计算目标年份中，目标月份之前的天数
+        # 1. 通过年份前缀和索引直接取得 1900 到目标年份之前所有年份的总天数
         idx = year - 1900
         if idx < 0 or idx >= len(Info.yearInfos):
             raise ValueError(f"Year {year} out of range")
+        offset = Info.yearOffsets[idx]
+
+        # 2. 计算目标年份中，目标月份之前的天数
         yearInfo = Info.yearInfos[idx]
 
         found = False
@@ -223,7 +376,7 @@ class LunarDate:
                 break
             offset += d
 
-        if not found:
+        if not found or not 1 <= day <= d:
             raise ValueError(
                 f"Invalid lunar date: {year}-{month}-{day} (leap={isLeapMonth})")
 
@@ -260,22 +413,111 @@ class LunarDate:
             return (month, offset + 1, isLeapMonth)
 
         offset = int(offset)
+        if offset < 0 or offset >= Info.yearOffsets[-1]:
+            raise ValueError("Offset %r out of range" % offset)
 
-        for idx, yearDay in enumerate(Info.yearDays()):
-            if offset < yearDay:
-                break
-            offset -= yearDay
+        # 二分查找偏移量所在的农历年
+        idx = bisect_right(Info.yearOffsets, offset) - 1
+        offset -= Info.yearOffsets[idx]
         year = 1900 + idx
 
         yearInfo = Info.yearInfos[idx]
         month, day, isLeapMonth = _calcMonthDay(yearInfo, offset)
         return LunarDate(year, month, day, isLeapMonth)
 
+    @classmethod
+    def _buildDayTable(cls) -> array:
+        """生成逐日查找表。
+
+        每一项对应从 1900-01-31 起的一天，按位打包农历信息：
+        bit 0-4 为日，bit 5 为闰月标记，bit 6-9 为月，bit 10 起为年份相对 1900 的偏移。
+        """
+        table = array("I")
+        for idx, yearInfo in enumerate(Info.yearInfos):
+            for month, days, isLeapMonth in cls._enumMonth(yearInfo):
+                base = (idx << 10) | (month << 6) | (int(isLeapMonth) << 5)
+                table.extend(range(base + 1, base + days + 1))
+        return table
+
+    @classmethod
+    def _getDayTable(cls) -> array:
+        """获取逐日查找表，首次调用时生成（线程安全）。"""
+        table = cls._dayTable
+        if table is None:
+            with cls._dayTableLock:
+                table = cls._dayTable
+                if table is None:
+                    table = cls._buildDayTable()
+                    cls._dayTable = table
+        return table
+
+    @classmethod
+    def _fromTable(cls, offset):
+        offset = int(offset)
+        table = cls._getDayTable()
+        if offset < 0 or offset >= len(table):
+            raise ValueError("Offset %r out of range" % offset)
+        packed = table[offset]
+        return LunarDate(
+            1900 + (packed >> 10),
+            (packed >> 6) & 0xF,
+            packed & 0x1F,
+            bool(packed & 0x20),
+        )
+
     def __init__(self, year, month, day, isLeapMonth=False):
-        self.year = year
-        self.month = month
-        self.day = day
-        self.isLeapMonth = bool(isLeapMonth)
+        object.__setattr__(self, "year", year)
+        object.__setattr__(self, "month", month)
+        object.__setattr__(self, "day", day)
+        object.__setattr__(self, "isLeapMonth", bool(isLeapMonth))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("LunarDate is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("LunarDate is immutable")
+
+    def __reduce__(self):
+        # 不可变类型无法按默认方式恢复属性，copy/pickle 时改为重新构造
+        return (LunarDate, (self.year, self.month, self.day, self.isLeapMonth))
+
+    def _key(self):
+        # 闰月排在同号正常月之后
+        return (self.year, self.month, self.isLeapMonth, self.day)
+
+    def __eq__(self, other):
+        if not isinstance(other, LunarDate):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __lt__(self, other):
+        if not isinstance(other, LunarDate):
+            return NotImplemented
+        return self._key() < other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        return "LunarDate(%d, %d, %d, %r)" % (
+            self.year, self.month, self.day, self.isLeapMonth)
+
+    def ganzhiYear(self) -> str:
+        """农历年干支，例如 "甲辰"。"""
+        n = (self.year - 4) % 60
+        return _TIANGAN[n % 10] + _DIZHI[n % 12]
+
+    def shengxiao(self) -> str:
+        """农历年生肖，例如 "龙"。"""
+        return _SHENGXIAO[(self.year - 4) % 12]
+
+    def toChinese(self) -> str:
+        """中文月日，例如 "九月十六"、"闰二月初一"。"""
+        return "{}{}月{}".format(
+            "闰" if self.isLeapMonth else "",
+            _LUNAR_MONTH_NAMES[self.month - 1],
+            _LUNAR_DAY_NAMES[self.day - 1],
+        )
 
 
 class Info:
@@ -438,19 +680,570 @@ class Info:
         return 29 * months + ((info // 16) & ((1 << months) - 1)).bit_count()
 
     def yearDays():
-        return [Info.yearInfo2yearDay(x) for x in Info.yearInfos]
+        return list(Info.yearDayList)
+
+
+# 每个农历年的天数，以及从 1900 年正月初一起的累计天数（前缀和）
+# yearOffsets[i] 为第 i 年正月初一相对起始日的偏移量，最后一项为总天数
+Info.yearDayList = tuple(Info.yearInfo2yearDay(x) for x in Info.yearInfos)
+Info.yearOffsets = tuple(accumulate(Info.yearDayList, initial=0))
+
+
+# 地球日心黄经 VSOP87 截断级数 (A, B, C)，每项为 A * cos(B + C * tau)
+# 取自 Meeus《Astronomical Algorithms》附录，精度约 1 角秒，折合节气时刻误差约 1 分钟
+_VSOP_L0 = (
+    (175347046, 0, 0), (3341656, 4.6692568, 6283.07585),
+    (34894, 4.6261, 12566.1517), (3497, 2.7441, 5753.3849),
+    (3418, 2.8289, 3.5231), (3136, 3.6277, 77713.7715),
+    (2676, 4.4181, 7860.4194), (2343, 6.1352, 3930.2097),
+    (1324, 0.7425, 11506.7698), (1273, 2.0371, 529.691),
+    (1199, 1.1096, 1577.3435), (990, 5.233, 5884.927),
+    (902, 2.045, 26.298), (857, 3.508, 398.149),
+    (780, 1.179, 5223.694), (753, 2.533, 5507.553),
+    (505, 4.583, 18849.228), (492, 4.205, 775.523),
+    (357, 2.92, 0.067), (317, 5.849, 11790.629),
+    (284, 1.899, 796.298), (271, 0.315, 10977.079),
+    (243, 0.345, 5486.778), (206, 4.806, 2544.314),
+    (205, 1.869, 5573.143), (202, 2.458, 6069.777),
+    (156, 0.833, 213.299), (132, 3.411, 2942.463),
+    (126, 1.083, 20.775), (115, 0.645, 0.98),
+    (103, 0.636, 4694.003), (102, 0.976, 15720.839),
+    (102, 4.267, 7.114), (99, 6.21, 2146.17),
+    (98, 0.68, 155.42), (86, 5.98, 161000.69),
+    (85, 1.3, 6275.96), (85, 3.67, 71430.7),
+    (80, 1.81, 17260.15), (79, 3.04, 12036.46),
+    (75, 1.76, 5088.63), (74, 3.5, 3154.69),
+    (74, 4.68, 801.82), (70, 0.83, 9437.76),
+    (62, 3.98, 8827.39), (61, 1.82, 7084.9),
+    (57, 2.78, 6286.6), (56, 4.39, 14143.5),
+    (56, 3.47, 6279.55), (52, 0.19, 12139.55),
+    (52, 1.33, 1748.02), (51, 0.28, 5856.48),
+    (49, 0.49, 1194.45), (41, 5.37, 8429.24),
+    (41, 2.4, 19651.05), (39, 6.17, 10447.39),
+    (37, 6.04, 10213.29), (37, 2.57, 1059.38),
+    (36, 1.71, 2352.87), (36, 1.78, 6812.77),
+    (33, 0.59, 17789.85), (30, 0.44, 83996.85),
+    (30, 2.74, 1349.87), (25, 3.16, 4690.48),
+)
+_VSOP_L1 = (
+    (628331966747, 0, 0), (206059, 2.678235, 6283.07585),
+    (4303, 2.6351, 12566.1517), (425, 1.59, 3.523),
+    (119, 5.796, 26.298), (109, 2.966, 1577.344),
+    (93, 2.59, 18849.23), (72, 1.14, 529.69),
+    (68, 1.87, 398.15), (67, 4.41, 5507.55),
+    (59, 2.89, 5223.69), (56, 2.17, 155.42),
+    (45, 0.4, 796.3), (36, 0.47, 775.52),
+    (29, 2.65, 7.11), (21, 5.34, 0.98),
+    (19, 1.85, 5486.78), (19, 4.97, 213.3),
+    (17, 2.99, 6275.96), (16, 0.03, 2544.31),
+    (16, 1.43, 2146.17), (15, 1.21, 10977.08),
+    (12, 2.83, 1748.02), (12, 3.26, 5088.63),
+    (12, 5.27, 1194.45), (12, 2.08, 4694),
+    (11, 0.77, 553.57), (10, 1.3, 6286.6),
+    (10, 4.24, 1349.87), (9, 2.7, 242.73),
+    (9, 5.64, 951.72), (8, 5.3, 2352.87),
+    (6, 2.65, 9437.76), (6, 4.67, 4690.48),
+)
+_VSOP_L2 = (
+    (52919, 0, 0), (8720, 1.0721, 6283.0758),
+    (309, 0.867, 12566.152), (27, 0.05, 3.52),
+    (16, 5.19, 26.3), (16, 3.68, 155.42),
+    (10, 0.76, 18849.23), (9, 2.06, 77713.77),
+    (7, 0.83, 775.52), (5, 4.66, 1577.34),
+    (4, 1.03, 7.11), (4, 3.44, 5573.14),
+    (3, 5.14, 796.3), (3, 6.05, 5507.55),
+    (3, 1.19, 242.73), (3, 6.12, 529.69),
+    (3, 0.31, 398.15), (3, 2.28, 553.57),
+    (2, 4.38, 5223.69), (2, 3.75, 0.98),
+)
+_VSOP_L3 = (
+    (289, 5.844, 6283.076), (35, 0, 0),
+    (17, 5.49, 12566.15), (3, 5.2, 155.42),
+    (1, 4.72, 3.52), (1, 5.3, 18849.23),
+    (1, 5.97, 242.73),
+)
+_VSOP_L4 = ((114, 3.142, 0), (8, 4.13, 6283.08), (1, 3.84, 12566.15))
+_VSOP_L5 = ((1, 3.14, 0),)
+# 日地距离级数（仅用于光行差修正，保留主要项即可）
+_VSOP_R0 = (
+    (100013989, 0, 0), (1670700, 3.0984635, 6283.07585),
+    (13956, 3.05525, 12566.1517), (3084, 5.1985, 77713.7715),
+    (1628, 1.1739, 5753.3849), (1576, 2.8469, 7860.4194),
+)
+_VSOP_R1 = ((103019, 1.10749, 6283.07585), (1721, 1.0644, 12566.1517))
+
+# 儒略日与公历序数 (date.toordinal) 的差值
+_JD_ORDINAL_OFFSET = 1721424.5
+
+
+class JieQi:
+    """二十四节气本地计算（不依赖网络与数据库）。
+
+    由 VSOP87 截断级数计算太阳视黄经，求出每个节气的交节时刻，
+    按北京时间（UTC+8）取日期。结果按年缓存。
+    """
+
+    # 以小寒（黄经 285°）为首，每个节气相差 15°
+    names = (
+        "小寒", "大寒", "立春", "雨水", "惊蛰", "春分",
+        "清明", "谷雨", "立夏", "小满", "芒种", "夏至",
+        "小暑", "大暑", "立秋", "处暑", "白露", "秋分",
+        "寒露", "霜降", "立冬", "小雪", "大雪", "冬至",
+    )
+
+    @staticmethod
+    def _series(terms, tau):
+        return sum(a * math.cos(b + c * tau) for a, b, c in terms)
+
+    @classmethod
+    def _apparentLongitude(cls, jde: float) -> float:
+        """计算太阳视黄经（度）。"""
+        tau = (jde - 2451545.0) / 365250
+        L = (
+            cls._series(_VSOP_L0, tau)
+            + cls._series(_VSOP_L1, tau) * tau
+            + cls._series(_VSOP_L2, tau) * tau ** 2
+            + cls._series(_VSOP_L3, tau) * tau ** 3
+            + cls._series(_VSOP_L4, tau) * tau ** 4
+            + cls._series(_VSOP_L5, tau) * tau ** 5
+        ) / 1e8
+        R = (cls._series(_VSOP_R0, tau) + cls._series(_VSOP_R1, tau) * tau) / 1e8
+
+        # 日心黄经 -> 地心黄经，并做 FK5 修正
+        longitude = math.degrees(L) + 180 - 0.09033 / 3600
+
+        # 章动（黄经章动主要项）与光行差，单位角秒
+        T = tau * 10
+        omega = math.radians(125.04452 - 1934.136261 * T)
+        sunMean = math.radians(280.4665 + 36000.7698 * T)
+        moonMean = math.radians(218.3165 + 481267.8813 * T)
+        nutation = (
+            -17.20 * math.sin(omega)
+            - 1.32 * math.sin(2 * sunMean)
+            - 0.23 * math.sin(2 * moonMean)
+            + 0.21 * math.sin(2 * omega)
+        )
+        aberration = -20.4898 / R
+        return (longitude + (nutation + aberration) / 3600) % 360
+
+    @staticmethod
+    def _deltaT(year: int) -> float:
+        """力学时与世界时之差 ΔT（秒），Espenak & Meeus 分段多项式。"""
+        if year < 1920:
+            t = year - 1900
+            return -2.79 + 1.494119 * t - 0.0598939 * t ** 2 \
+                + 0.0061966 * t ** 3 - 0.000197 * t ** 4
+        if year < 1941:
+            t = year - 1920
+            return 21.20 + 0.84493 * t - 0.076100 * t ** 2 + 0.0020936 * t ** 3
+        if year < 1961:
+            t = year - 1950
+            return 29.07 + 0.407 * t - t ** 2 / 233 + t ** 3 / 2547
+        if year < 1986:
+            t = year - 1975
+            return 45.45 + 1.067 * t - t ** 2 / 260 - t ** 3 / 718
+        if year < 2005:
+            t = year - 2000
+            return 63.86 + 0.3345 * t - 0.060374 * t ** 2 + 0.0017275 * t ** 3 \
+                + 0.000651814 * t ** 4 + 0.00002373599 * t ** 5
+        t = year - 2000
+        return 62.92 + 0.32217 * t + 0.005589 * t ** 2
+
+    @classmethod
+    def _termDate(cls, year: int, index: int) -> datetime.date:
+        """计算某年第 index 个节气（0=小寒）的北京时间日期。"""
+        target = (285 + 15 * index) % 360
+        # 以平均节气间隔给出初值，再用牛顿迭代逼近（太阳每天约行 1°）
+        jde = datetime.date(year, 1, 6).toordinal() + _JD_ORDINAL_OFFSET \
+            + index * 15.2184
+        for _ in range(10):
+            diff = (target - cls._apparentLongitude(jde) + 180) % 360 - 180
+            jde += diff * 365.2422 / 360
+            if abs(diff) < 1e-6:
+                break
+        local = jde - cls._deltaT(year) / 86400 + 8 / 24 - _JD_ORDINAL_OFFSET
+        return datetime.date.fromordinal(math.floor(local))
+
+    @classmethod
+    @lru_cache(maxsize=32)
+    def termsOfYear(cls, year: int) -> Tuple[Tuple[int, str], ...]:
+        """获取某公历年全部节气，返回按日期排序的 (公历序数, 名称) 元组。"""
+        if not 1900 <= year < 1900 + len(Info.yearInfos):
+            raise ValueError(f"Year {year} out of range")
+        return tuple(
+            (cls._termDate(year, i).toordinal(), name)
+            for i, name in enumerate(cls.names)
+        )
+
+    @classmethod
+    def fromSolarDate(cls, year, month, day) -> str:
+        """获取某天的节气名称，非交节日返回空字符串。"""
+        ordinal = datetime.date(year, month, day).toordinal()
+        terms = cls.termsOfYear(year)
+        idx = bisect_left(terms, (ordinal,))
+        if idx < len(terms) and terms[idx][0] == ordinal:
+            return terms[idx][1]
+        return ""
+
+    @classmethod
+    def next(cls, date) -> Optional[Tuple[datetime.date, str]]:
+        """获取不早于 date 的第一个节气，返回 (日期, 名称)，超出支持范围返回 None。"""
+        ordinal = datetime.date(date.year, date.month, date.day).toordinal()
+        for year in (date.year, date.year + 1):
+            try:
+                terms = cls.termsOfYear(year)
+            except ValueError:
+                return None
+            idx = bisect_left(terms, (ordinal,))
+            if idx < len(terms):
+                return datetime.date.fromordinal(terms[idx][0]), terms[idx][1]
+        return None
+
+
+# 纪念日规则类型
+ANNIVERSARY_SOLAR_YEARLY = "solar_yearly"  # MM-DD
+ANNIVERSARY_SOLAR_ONCE = "solar_once"  # YYYY-MM-DD
+ANNIVERSARY_LUNAR_YEARLY = "lunar_yearly"  # nMM-DD
+ANNIVERSARY_LUNAR_ONCE = "lunar_once"  # nYYYY-MM-DD
+
+
+class AnniversaryRule(NamedTuple):
+    """编译后的纪念日规则。"""
+
+    kind: str
+    year: Optional[int]
+    month: int
+    day: int
+    name: str
+
+    @property
+    def is_lunar(self) -> bool:
+        return self.kind in (ANNIVERSARY_LUNAR_YEARLY, ANNIVERSARY_LUNAR_ONCE)
+
+    def matches(self, date: datetime.date, lunar: "LunarDate") -> bool:
+        """判断规则是否命中某天（lunar 为该天对应的农历日期）。"""
+        if self.is_lunar:
+            y, m, d = lunar.year, lunar.month, lunar.day
+        else:
+            y, m, d = date.year, date.month, date.day
+        if m != self.month or d != self.day:
+            return False
+        return self.year is None or self.year == y
+
+    def next_occurrence(
+        self, today: datetime.date, lunar_year: int
+    ) -> Optional[datetime.date]:
+        """计算不早于 today 的下一次公历日期，没有则返回 None。
+
+        Args:
+            today: 起始日期。
+            lunar_year: today 对应的农历年份。
+        """
+        if self.kind == ANNIVERSARY_SOLAR_ONCE:
+            target = datetime.date(self.year, self.month, self.day)
+            return target if target >= today else None
+        if self.kind == ANNIVERSARY_LUNAR_ONCE:
+            try:
+                target = LunarDate.toSolarDate(self.year, self.month, self.day)
+            except ValueError:
+                return None
+            return target if target >= today else None
+
+        # 每年纪念日取最近一个存在该日期的年份（如 02-29、农历小月的三十）
+        if self.kind == ANNIVERSARY_SOLAR_YEARLY:
+            years = range(today.year, today.year + 9)
+        else:
+            years = range(lunar_year, 1900 + len(Info.yearInfos))
+        for year in years:
+            try:
+                if self.kind == ANNIVERSARY_SOLAR_YEARLY:
+                    target = datetime.date(year, self.month, self.day)
+                else:
+                    target = LunarDate.toSolarDate(year, self.month, self.day)
+            except ValueError:
+                continue
+            if target >= today:
+                return target
+        return None
+
+
+def _compile_anniversary(key: str, name: str) -> AnniversaryRule:
+    """将一条纪念日配置编译为规则，配置无效时抛出 ValueError。"""
+    is_lunar = key.startswith("n")
+    parts = [int(p) for p in (key[1:] if is_lunar else key).split("-")]
+    if len(parts) == 3:
+        year, month, day = parts
+        kind = ANNIVERSARY_LUNAR_ONCE if is_lunar else ANNIVERSARY_SOLAR_ONCE
+    elif len(parts) == 2:
+        year = None
+        month, day = parts
+        kind = ANNIVERSARY_LUNAR_YEARLY if is_lunar else ANNIVERSARY_SOLAR_YEARLY
+    else:
+        raise ValueError("unsupported format")
+
+    if kind == ANNIVERSARY_SOLAR_ONCE:
+        datetime.date(year, month, day)
+    elif kind == ANNIVERSARY_SOLAR_YEARLY:
+        # 以闰年校验，允许 02-29
+        datetime.date(2000, month, day)
+    else:
+        if not (1 <= month <= 12 and 1 <= day <= 30):
+            raise ValueError("lunar month/day out of range")
+        if year is not None:
+            LunarDate.toSolarDate(year, month, day)
+    return AnniversaryRule(kind, year, month, day, name)
+
+
+def compile_anniversaries(anniversaries: Dict[str, str]) -> List[AnniversaryRule]:
+    """将纪念日配置编译为规则列表，无效配置记录一次警告后忽略。
+
+    支持的配置格式（key）：
+    - "YYYY-MM-DD": 公历一次性纪念日
+    - "MM-DD": 公历每年纪念日
+    - "nYYYY-MM-DD": 农历一次性纪念日
+    - "nMM-DD": 农历每年纪念日
+    """
+    rules: List[AnniversaryRule] = []
+    for key, name in (anniversaries or {}).items():
+        if not key or not name:
+            continue
+        try:
+            rules.append(_compile_anniversary(str(key).strip(), name))
+        except ValueError as e:
+            _LOGGER.warning("忽略无效的纪念日配置 %s: %s (%s)", key, name, e)
+    return rules
+
+
+class AnniversaryIndex:
+    """纪念日规则的哈希索引。
+
+    按公历 (月, 日)、公历 (年, 月, 日)、农历 (月, 日)、农历 (年, 月, 日) 分别建立字典，
+    匹配某一天只需几次字典查找，与纪念日数量无关。命中结果保持配置中的顺序。
+    """
+
+    def __init__(self, rules: Iterable[AnniversaryRule]):
+        self.rules: List[AnniversaryRule] = list(rules)
+        self._solar: Dict[Tuple[int, ...], List[Tuple[int, str]]] = {}
+        self._lunar: Dict[Tuple[int, ...], List[Tuple[int, str]]] = {}
+        for seq, rule in enumerate(self.rules):
+            table = self._lunar if rule.is_lunar else self._solar
+            if rule.year is None:
+                key: Tuple[int, ...] = (rule.month, rule.day)
+            else:
+                key = (rule.year, rule.month, rule.day)
+            table.setdefault(key, []).append((seq, rule.name))
+        # 与索引一同创建的未来纪念日排程，二者作为整体替换
+        self.schedule = AnniversarySchedule(self.rules)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def match(self, date: datetime.date, lunar: Optional["LunarDate"]) -> List[str]:
+        """获取某天命中的纪念日名称（lunar 为该天对应的农历日期，可为 None）。"""
+        hits: List[Tuple[int, str]] = []
+        if self._solar:
+            hits += self._solar.get((date.month, date.day), [])
+            hits += self._solar.get((date.year, date.month, date.day), [])
+        if self._lunar and lunar is not None:
+            hits += self._lunar.get((lunar.month, lunar.day), [])
+            hits += self._lunar.get((lunar.year, lunar.month, lunar.day), [])
+        if len(hits) > 1:
+            hits.sort()
+        return [name for _, name in hits]
+
+
+class AnniversarySchedule:
+    """未来纪念日的增量排程。
+
+    以最小堆保存每条规则的下一次公历日期 (ordinal, seq, rule)。日期推进时
+    只弹出已过期的条目并重新排到下一次发生日，其余条目保持不动；同一天内的
+    重复查询直接返回缓存结果。
+    """
+
+    def __init__(self, rules: Iterable[AnniversaryRule]):
+        self._rules = list(rules)
+        self._heap: List[Tuple[int, int, AnniversaryRule]] = []
+        self._ordinal: Optional[int] = None  # 当前排程对应的日期
+        self._items: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _lunar_year(today: datetime.date) -> int:
+        try:
+            return LunarDate.fromSolarDate(today.year, today.month, today.day).year
+        except ValueError:
+            return today.year  # Fallback
+
+    def upcoming(self, today: datetime.date) -> List[Dict[str, Any]]:
+        """获取不早于 today 的纪念日列表，按天数差排序。"""
+        ordinal = today.toordinal()
+        with self._lock:
+            if self._ordinal is None or ordinal < self._ordinal:
+                self._rebuild(today)
+            elif ordinal > self._ordinal:
+                self._advance(today)
+            else:
+                return list(self._items)
+
+            self._ordinal = ordinal
+            self._items = [
+                {
+                    "name": rule.name,
+                    "date": datetime.date.fromordinal(target).strftime("%Y-%m-%d"),
+                    "days_diff": target - ordinal,
+                }
+                for target, _, rule in sorted(self._heap)
+            ]
+            return list(self._items)
+
+    def _rebuild(self, today: datetime.date) -> None:
+        lunar_year = self._lunar_year(today)
+        heap = []
+        for seq, rule in enumerate(self._rules):
+            target = rule.next_occurrence(today, lunar_year)
+            if target:
+                heap.append((target.toordinal(), seq, rule))
+        heapq.heapify(heap)
+        self._heap = heap
+
+    def _advance(self, today: datetime.date) -> None:
+        ordinal = today.toordinal()
+        lunar_year = None
+        while self._heap and self._heap[0][0] < ordinal:
+            _, seq, rule = heapq.heappop(self._heap)
+            if rule.year is not None:
+                continue  # 一次性纪念日已过，不再排程
+            if lunar_year is None:
+                lunar_year = self._lunar_year(today)
+            target = rule.next_occurrence(today, lunar_year)
+            if target:
+                heapq.heappush(self._heap, (target.toordinal(), seq, rule))
+
+
+def load_anniversaries_file(path: str) -> Dict[str, str]:
+    """读取外部纪念日文件，返回与 configuration.yaml 中 anniversaries 相同格式的字典。
+
+    按扩展名识别格式：
+    - .yaml / .yml / .json: 顶层为 {key: name} 映射
+    - .csv: 每行 "key,name"，允许以 key/date 开头的表头行和 # 开头的注释行
+    """
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if ext == ".csv":
+            data = {}
+            for row in csv.reader(f):
+                if len(row) < 2 or not row[0].strip() or row[0].startswith("#"):
+                    continue
+                if row[0].strip().lower() in ("key", "date"):
+                    continue
+                data[row[0].strip()] = row[1].strip()
+            return data
+        if ext == ".json":
+            data = json.load(f)
+        elif ext in (".yaml", ".yml"):
+            if yaml is None:
+                raise ValueError("读取 YAML 纪念日文件需要安装 PyYAML")
+            data = yaml.safe_load(f) or {}
+        else:
+            raise ValueError("不支持的纪念日文件格式: %s" % ext)
+    if not isinstance(data, dict):
+        raise ValueError("纪念日文件顶层必须是 key: name 映射")
+    return {str(k): str(v) for k, v in data.items() if v is not None}
+
+
+def load_seed(path: str) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """读取内置的节假日安排，展开为 {year: {mmdd: item}}。
+
+    文件按通知年份列出放假区间与调休上班日；放假日为 type=2，
+    调休上班日为 type=0 (补班)。文件缺失或格式错误时返回空字典。
+    """
+    data: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            seed = json.load(f)
+        for entries in seed.get("years", {}).values():
+            for entry in entries:
+                start, end = (
+                    datetime_class.strptime(d, "%Y%m%d").date()
+                    for d in entry["holiday"]
+                )
+                days = [
+                    (start + timedelta(days=i), 2, entry["name"])
+                    for i in range((end - start).days + 1)
+                ]
+                days.extend(
+                    (datetime_class.strptime(d, "%Y%m%d").date(), 0, "补班")
+                    for d in entry.get("workdays", [])
+                )
+                for day, day_type, typename in days:
+                    day_str = day.strftime("%Y%m%d")
+                    data.setdefault(day_str[:4], {})[day_str[4:]] = {
+                        "day": day_str,
+                        "type": day_type,
+                        "typename": typename,
+                    }
+    except FileNotFoundError:
+        _LOGGER.debug("未找到内置节假日数据: %s", path)
+    except Exception as e:
+        _LOGGER.error("读取内置节假日数据失败: %s", e)
+    return data
 
 
 class HolidayDB:
-    """简化的 SQLite 存储封装，用于数据备份。"""
+    """SQLite 存储封装，节假日数据的持久化存储。"""
+
+    # holiday_detail 的数据列（不含 row_hash），顺序与 _to_row 一致
+    COLUMNS = (
+        "day", "status", "type", "typename", "unixtime", "yearname",
+        "nonglicn", "nongli", "shengxiao", "jieqi", "weekcn",
+        "week1", "week2", "week3", "daynum", "weeknum", "avoid", "suit",
+        "solar_festival", "lunar_festival", "festival",
+    )
+    # 常驻内存的精简字段，足以判断状态与查找节假日
+    SUMMARY_FIELDS = ("day", "status", "type", "typename")
+    # 以 JSON 文本存储的列表字段
+    _LIST_FIELDS = ("solar_festival", "lunar_festival", "festival")
 
     def __init__(self, db_path: str):
         self.db_path = db_path
+        # 每个线程一个长连接（HA 会在多个执行器线程中调用）
+        self._local = threading.local()
+        self._conns: List[sqlite3.Connection] = []
+        self._conns_lock = threading.Lock()
         self._init_table()
 
-    def _get_conn(self):
-        """获取数据库连接"""
-        return sqlite3.connect(self.db_path, check_same_thread=False)
+    def _get_conn(self) -> sqlite3.Connection:
+        """获取当前线程的数据库长连接，首次使用时创建。
+
+        连接开启 WAL 日志模式并调整同步级别与页缓存；sqlite3 按 SQL 文本
+        缓存预编译语句，复用连接即可复用语句。数据库文件与表在构造时创建，
+        查询前不再逐次检查文件是否存在，异常由各查询方法统一处理。
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_path, check_same_thread=False, cached_statements=64
+            )
+            conn.row_factory = sqlite3.Row  # 允许通过列名访问
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA cache_size=-2000")  # 约 2MB
+            conn.execute("PRAGMA temp_store=MEMORY")
+            self._local.conn = conn
+            with self._conns_lock:
+                self._conns.append(conn)
+        return conn
+
+    def close(self) -> None:
+        """关闭所有线程创建的数据库连接。"""
+        with self._conns_lock:
+            conns, self._conns = self._conns, []
+        for conn in conns:
+            try:
+                conn.close()
+            except Exception as e:
+                _LOGGER.debug("关闭数据库连接失败: %s", e)
+        self._local = threading.local()
 
     def _ensure_columns(self, conn, table_name: str, columns: Dict[str, str]):
         cursor = conn.execute(f"PRAGMA table_info({table_name})")
@@ -461,64 +1254,148 @@ class HolidayDB:
             conn.execute(
                 f"ALTER TABLE {table_name} ADD COLUMN {name} {col_type}")
 
+    def _migrate_v1(self, conn: sqlite3.Connection) -> None:
+        """基础表结构及节日列。"""
+        # 1. 创建元数据表
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS meta_info (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        """
+        )
+
+        # 2. 创建详细数据表 (字段一一对应)
+        # day: 20260201
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS holiday_detail (
+                day TEXT PRIMARY KEY,
+                status INTEGER,
+                type INTEGER,
+                typename TEXT,
+                unixtime INTEGER,
+                yearname TEXT,
+                nonglicn TEXT,
+                nongli TEXT,
+                shengxiao TEXT,
+                jieqi TEXT,
+                weekcn TEXT,
+                week1 TEXT,
+                week2 TEXT,
+                week3 TEXT,
+                daynum INTEGER,
+                weeknum INTEGER,
+                avoid TEXT,
+                suit TEXT,
+                solar_festival TEXT,
+                lunar_festival TEXT,
+                festival TEXT
+            )
+        """
+        )
+        # 早期版本的表没有节日列
+        self._ensure_columns(
+            conn,
+            "holiday_detail",
+            {
+                "solar_festival": "TEXT",
+                "lunar_festival": "TEXT",
+                "festival": "TEXT",
+            },
+        )
+
+    def _migrate_v2(self, conn: sqlite3.Connection) -> None:
+        """内容哈希列，用于跳过未变化的行。"""
+        self._ensure_columns(conn, "holiday_detail", {"row_hash": "TEXT"})
+
+    def _migrate_v3(self, conn: sqlite3.Connection) -> None:
+        """整数日期列 (YYYYMMDD) 及索引，用于范围查询与按类型查找。"""
+        self._ensure_columns(conn, "holiday_detail", {"day_int": "INTEGER"})
+        conn.execute(
+            "UPDATE holiday_detail SET day_int = CAST(day AS INTEGER) "
+            "WHERE day_int IS NULL"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_holiday_detail_day_int "
+            "ON holiday_detail (day_int)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_holiday_detail_type "
+            "ON holiday_detail (type, day_int)"
+        )
+
+    # 按顺序执行的迁移，第 i 项把 user_version 升级到 i + 1
+    _MIGRATIONS = (_migrate_v1, _migrate_v2, _migrate_v3)
+    SCHEMA_VERSION = len(_MIGRATIONS)
+
     def _init_table(self):
-        """初始化全量数据表"""
-        try:
-            with self._get_conn() as conn:
-                # 1. 创建元数据表
-                conn.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS meta_info (
-                        key TEXT PRIMARY KEY,
-                        value TEXT
-                    )
-                """
-                )
+        """按 PRAGMA user_version 执行尚未完成的表结构迁移。
 
-                # 2. 创建详细数据表 (字段一一对应)
-                # day: 20260201
-                conn.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS holiday_detail (
-                        day TEXT PRIMARY KEY,
-                        status INTEGER,
-                        type INTEGER,
-                        typename TEXT,
-                        unixtime INTEGER,
-                        yearname TEXT,
-                        nonglicn TEXT,
-                        nongli TEXT,
-                        shengxiao TEXT,
-                        jieqi TEXT,
-                        weekcn TEXT,
-                        week1 TEXT,
-                        week2 TEXT,
-                        week3 TEXT,
-                        daynum INTEGER,
-                        weeknum INTEGER,
-                        avoid TEXT,
-                        suit TEXT,
-                        solar_festival TEXT,
-                        lunar_festival TEXT,
-                        festival TEXT
-                    )
-                """
-                )
-                self._ensure_columns(
-                    conn,
-                    "holiday_detail",
-                    {
-                        "solar_festival": "TEXT",
-                        "lunar_festival": "TEXT",
-                        "festival": "TEXT",
-                    },
-                )
-                conn.commit()
+        结构已是最新版本时只读取一次 user_version。每个迁移在独立事务中
+        执行，并可在未记录版本号的旧数据库上重复执行。
+        """
+        try:
+            conn = self._get_conn()
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version >= self.SCHEMA_VERSION:
+                return
+            for target, migrate in enumerate(self._MIGRATIONS, 1):
+                if target <= version:
+                    continue
+                conn.execute("BEGIN")
+                try:
+                    migrate(self, conn)
+                    conn.execute(f"PRAGMA user_version = {target}")
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                _LOGGER.debug("数据库结构已升级到版本 %d", target)
         except Exception as e:
             _LOGGER.error("初始化数据库失败: %s", e)
 
-    def save_full(self, data_list: List[Dict[str, Any]], update_time: str):
-        """保存全量数据列表到数据库"""
+    @staticmethod
+    def _to_row(item: Dict[str, Any]) -> Tuple[Any, ...]:
+        """将数据项转换为 holiday_detail 行（不含 row_hash）。"""
+        return (
+            item.get("day"),
+            item.get("status"),
+            item.get("type"),
+            item.get("typename"),
+            item.get("unixtime"),
+            item.get("yearname"),
+            item.get("nonglicn"),
+            item.get("nongli"),
+            item.get("shengxiao"),
+            item.get("jieqi"),
+            item.get("weekcn"),
+            item.get("week1"),
+            item.get("week2"),
+            item.get("week3"),
+            item.get("daynum"),
+            item.get("weeknum"),
+            item.get("avoid"),
+            item.get("suit"),
+            json.dumps(item.get("solar_festival") or [], ensure_ascii=False),
+            json.dumps(item.get("lunar_festival") or [], ensure_ascii=False),
+            json.dumps(item.get("festival") or [], ensure_ascii=False),
+        )
+
+    def save_full(
+        self, data_list: List[Dict[str, Any]], update_time: str
+    ) -> Dict[str, int]:
+        """保存全量数据列表到数据库。
+
+        在单个事务中批量写入，内容哈希与库中一致的行直接跳过。
+
+        Returns:
+            Dict[str, int]: 新增 (inserted)、更新 (updated)、未变化 (unchanged) 的行数。
+        """
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+        rows = self._prepare_rows(data_list)
+
         try:
             with self._get_conn() as conn:
                 # 1. 保存更新时间
@@ -527,59 +1404,114 @@ class HolidayDB:
                     ("update_time", update_time),
                 )
 
-                # 2. 保存详细数据
-                for item in data_list:
-                    conn.execute(
-                        """
-                        REPLACE INTO holiday_detail (
-                            day, status, type, typename, unixtime, yearname, 
-                            nonglicn, nongli, shengxiao, jieqi, weekcn, 
-                            week1, week2, week3, daynum, weeknum, avoid, suit,
-                            solar_festival, lunar_festival, festival
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                        (
-                            item.get("day"),
-                            item.get("status"),
-                            item.get("type"),
-                            item.get("typename"),
-                            item.get("unixtime"),
-                            item.get("yearname"),
-                            item.get("nonglicn"),
-                            item.get("nongli"),
-                            item.get("shengxiao"),
-                            item.get("jieqi"),
-                            item.get("weekcn"),
-                            item.get("week1"),
-                            item.get("week2"),
-                            item.get("week3"),
-                            item.get("daynum"),
-                            item.get("weeknum"),
-                            item.get("avoid"),
-                            item.get("suit"),
-                            json.dumps(item.get("solar_festival")
-                                       or [], ensure_ascii=False),
-                            json.dumps(item.get("lunar_festival")
-                                       or [], ensure_ascii=False),
-                            json.dumps(item.get("festival")
-                                       or [], ensure_ascii=False),
-                        ),
+                # 2. 对比已存储行的内容哈希，只写入新增或变化的行
+                existing: Dict[str, Optional[str]] = {}
+                if rows:
+                    days = [row[0] for row in rows]
+                    cursor = conn.execute(
+                        "SELECT day, row_hash FROM holiday_detail WHERE day BETWEEN ? AND ?",
+                        (min(days), max(days)),
                     )
-                conn.commit()
+                    existing = {r[0]: r[1] for r in cursor}
+
+                changed = []
+                for row in rows:
+                    if row[0] not in existing:
+                        counts["inserted"] += 1
+                    elif existing[row[0]] != row[-2]:
+                        counts["updated"] += 1
+                    else:
+                        counts["unchanged"] += 1
+                        continue
+                    changed.append(row)
+
+                conn.executemany(self._INSERT_SQL.format("REPLACE"), changed)
         except Exception as e:
-            _LOGGER.error("备份数据到数据库失败: %s", e)
+            _LOGGER.error("保存数据到数据库失败: %s", e)
+            return {"inserted": 0, "updated": 0, "unchanged": 0}
+        return counts
 
-    def load(self) -> Dict[str, Any]:
-        """从数据库加载数据（重构为内存使用的格式）"""
-        data = {}
-        try:
-            if not os.path.exists(self.db_path):
-                return data
+    def import_missing(
+        self, data_list: List[Dict[str, Any]], update_time: Optional[str]
+    ) -> int:
+        """导入数据库中尚不存在的日期，已有的行保持不变。
 
-            with self._get_conn() as conn:
-                conn.row_factory = sqlite3.Row  # 允许通过列名访问
+        用于从旧版本的缓存文件迁移，更新时间仅在库中没有记录时写入。
+
+        Returns:
+            int: 实际新增的行数。
+
+        Raises:
+            sqlite3.Error: 写入失败时抛出，调用方据此决定是否保留旧文件。
+        """
+        rows = self._prepare_rows(data_list)
+        with self._get_conn() as conn:
+            if update_time:
+                conn.execute(
+                    "INSERT OR IGNORE INTO meta_info (key, value) VALUES (?, ?)",
+                    ("update_time", update_time),
+                )
+            before = conn.total_changes
+            conn.executemany(self._INSERT_SQL.format("INSERT OR IGNORE"), rows)
+            return conn.total_changes - before
+
+    _INSERT_SQL = """
+        {} INTO holiday_detail (
+            day, status, type, typename, unixtime, yearname,
+            nonglicn, nongli, shengxiao, jieqi, weekcn,
+            week1, week2, week3, daynum, weeknum, avoid, suit,
+            solar_festival, lunar_festival, festival, row_hash,
+            day_int
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
 
-                # 1. 加载更新时间
+    def _prepare_rows(self, data_list: List[Dict[str, Any]]) -> List[Tuple[Any, ...]]:
+        """转换为待写入的行，附加内容哈希与整数日期，跳过无效日期。"""
+        rows = []
+        for item in data_list:
+            row = self._to_row(item)
+            if not row[0]:
+                continue
+            row_hash = hashlib.sha1(
+                json.dumps(row, ensure_ascii=False).encode("utf-8")
+            ).hexdigest()
+            try:
+                day_int = int(row[0])
+            except ValueError:
+                continue
+            rows.append(row + (row_hash, day_int))
+        return rows
+
+    def _row_to_item(self, row: sqlite3.Row) -> Dict[str, Any]:
+        """将 holiday_detail 行转换为内存使用的数据项。"""
+        item = dict(row)  # 转换为字典
+        item.pop("row_hash", None)
+        for key in self._LIST_FIELDS:
+            if key in item:
+                item[key] = self._parse_json_list(item[key])
+        return item
+
+    def _select_columns(self, fields: Optional[Iterable[str]]) -> str:
+        """生成 SELECT 的列清单，字段名必须属于 COLUMNS。"""
+        if fields is None:
+            return ", ".join(self.COLUMNS)
+        fields = list(fields)
+        unknown = [f for f in fields if f not in self.COLUMNS]
+        if unknown:
+            raise ValueError("未知字段: {}".format(", ".join(unknown)))
+        if "day" not in fields:
+            fields.insert(0, "day")
+        return ", ".join(fields)
+
+    def load_index(self) -> Dict[str, Any]:
+        """加载更新时间与库中已有的年份列表，不读取逐日数据。
+
+        Returns:
+            Dict: {"update_time": str, "years": [YYYY, ...]}，无数据时为空字典。
+        """
+        data: Dict[str, Any] = {}
+        try:
+            with self._get_conn() as conn:
                 cursor = conn.execute(
                     "SELECT value FROM meta_info WHERE key='update_time'"
                 )
@@ -587,60 +1519,113 @@ class HolidayDB:
                 if row:
                     data["update_time"] = row[0]
 
-                # 2. 加载节假日数据，重构为 {year: {mmdd: full_item_dict}} 格式
-                cursor = conn.execute("SELECT * FROM holiday_detail")
-                for row in cursor:
-                    item = dict(row)  # 转换为字典
-                    item["solar_festival"] = self._parse_json_list(
-                        item.get("solar_festival")
-                    )
-                    item["lunar_festival"] = self._parse_json_list(
-                        item.get("lunar_festival")
-                    )
-                    item["festival"] = self._parse_json_list(
-                        item.get("festival"))
-                    day_str = item.get("day")
-                    if not day_str or len(day_str) != 8:
-                        continue
+                # day 为主键，按前缀去重只需扫描索引
+                cursor = conn.execute(
+                    "SELECT DISTINCT substr(day, 1, 4) FROM holiday_detail "
+                    "WHERE length(day) = 8"
+                )
+                years = sorted(r[0] for r in cursor if r[0].isdigit())
+                if years:
+                    data["years"] = years
+        except Exception as e:
+            _LOGGER.error("从数据库加载年份索引失败: %s", e)
+        return data
 
-                    year = day_str[:4]
-                    date_short = day_str[4:]  # MMDD
+    def load_year(
+        self, year: str, fields: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        """加载某一年的数据，返回 {mmdd: item_dict}。
 
-                    if year not in data:
-                        data[year] = {}
+        Args:
+            year: 年份。
+            fields: 只读取的列（始终包含 day），None 表示全部列。
+        """
+        try:
+            year = int(year)
+        except (TypeError, ValueError):
+            return {}
+        # 整年即一次 day_int 范围查询
+        items = self.get_range(datetime.date(year, 1, 1),
+                               datetime.date(year, 12, 31), fields)
+        return {item["day"][4:]: item for item in items
+                if item.get("day") and len(item["day"]) == 8}
 
-                    # 存储完整数据对象
-                    data[year][date_short] = item
+    def load(self) -> Dict[str, Any]:
+        """从数据库加载全部数据（重构为内存使用的格式）
 
-        except Exception as e:
-            _LOGGER.error("从数据库加载数据失败: %s", e)
+        返回 {"update_time": str, year: {mmdd: full_item_dict}}。
+        """
+        index = self.load_index()
+        data: Dict[str, Any] = {}
+        if "update_time" in index:
+            data["update_time"] = index["update_time"]
+        for year in index.get("years", []):
+            data[year] = self.load_year(year)
         return data
 
     def get_day_detail(self, day_str: str) -> Dict[str, Any]:
         try:
-            if not os.path.exists(self.db_path):
-                return {}
             with self._get_conn() as conn:
-                conn.row_factory = sqlite3.Row
                 cursor = conn.execute(
-                    "SELECT * FROM holiday_detail WHERE day = ?", (day_str,)
+                    "SELECT {} FROM holiday_detail WHERE day = ?".format(
+                        self._select_columns(None)),
+                    (day_str,),
                 )
                 row = cursor.fetchone()
                 if not row:
                     return {}
-                item = dict(row)
-                item["solar_festival"] = self._parse_json_list(
-                    item.get("solar_festival")
+                return self._row_to_item(row)
+        except Exception as e:
+            _LOGGER.error("从数据库获取日期详情失败: %s", e)
+            return {}
+
+    @staticmethod
+    def _day_int(date) -> int:
+        """日期对象转换为 YYYYMMDD 整数。"""
+        return date.year * 10000 + date.month * 100 + date.day
+
+    def get_range(
+        self, start, end, fields: Optional[Iterable[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """按日期范围查询数据，按日期升序返回。
+
+        Args:
+            start: 起始日期（含）。
+            end: 结束日期（含）。
+            fields: 只读取的列（始终包含 day），None 表示全部列。
+        """
+        columns = self._select_columns(fields)
+        try:
+            with self._get_conn() as conn:
+                cursor = conn.execute(
+                    "SELECT {} FROM holiday_detail WHERE day_int BETWEEN ? AND ? "
+                    "ORDER BY day_int".format(columns),
+                    (self._day_int(start), self._day_int(end)),
                 )
-                item["lunar_festival"] = self._parse_json_list(
-                    item.get("lunar_festival")
+                return [self._row_to_item(row) for row in cursor]
+        except Exception as e:
+            _LOGGER.error("从数据库查询日期范围失败: %s", e)
+            return []
+
+    def _find_next(self, where: str, params: Tuple[Any, ...]) -> Dict[str, Any]:
+        try:
+            with self._get_conn() as conn:
+                cursor = conn.execute(
+                    "SELECT {} FROM holiday_detail WHERE {} AND day_int >= ? "
+                    "ORDER BY day_int LIMIT 1".format(
+                        self._select_columns(None), where),
+                    params,
                 )
-                item["festival"] = self._parse_json_list(item.get("festival"))
-                return item
+                row = cursor.fetchone()
+                return self._row_to_item(row) if row else {}
         except Exception as e:
-            _LOGGER.error("从数据库获取日期详情失败: %s", e)
+            _LOGGER.error("从数据库查找日期失败: %s", e)
             return {}
 
+    def next_of_type(self, day_type: int, start) -> Dict[str, Any]:
+        """查找 start（含）之后第一个指定类型的日期，如 2=节假日。"""
+        return self._find_next("type = ?", (day_type, self._day_int(start)))
+
     def _parse_json_list(self, value):
         if not value:
             return []
@@ -665,11 +1650,55 @@ class Holiday:
     # 状态码映射
     STATUS_MAP = {0: "工作日", 1: "休息日", 2: "节假日"}
 
-    def __init__(self, anniversaries=None):
-        """初始化 Holiday 类。"""
+    def __init__(
+        self,
+        anniversaries=None,
+        anniversaries_file: Optional[str] = None,
+        preload_years: int = 1,
+        db=None,
+    ):
+        """初始化 Holiday 类。
+
+        Args:
+            anniversaries: 自定义纪念日配置 {key: name}。
+            anniversaries_file: 可选的外部纪念日文件（YAML/JSON/CSV），
+                修改后通过 reload_anniversaries() 热加载，同名 key 覆盖 anniversaries。
+            preload_years: 启动时从数据库预加载今年前后各多少年的数据，
+                其余年份在首次访问时加载。
+            db: 存储后端，需提供与 HolidayDB 相同的读写方法；
+                默认使用组件目录下的 SQLite 数据库。
+        """
         self._holiday_json: Dict[str, Any] = {}
+        # 数据库中已有、但尚未加载到 _holiday_json 的年份
+        self._pending_years: set = set()
+        self._year_load_lock = threading.Lock()
+        self._preload_years = preload_years
+        # 内置的节假日安排，用于补齐尚未联网获取的月份
+        self._seed = load_seed(HOLIDAY_SEED_FILE)
+        # 首次安装时内置数据的载入时间，在此之后一段时间内不联网更新
+        self._seeded_at: Optional[datetime.datetime] = None
+        # 按年编译的节日索引，每年为 [(ordinal, priority, seq, name, full_info)]
+        self._festival_index = _YearCache(self._compile_festival_index)
+        # 按年编译的状态数组，下标为年内第几天（从 0 开始），值为状态码
+        self._status_index = _YearCache(self._compile_status_array)
+        # 按年累计的工作日计数，prefix[i] 为该年前 i 天中的工作日数
+        self._workday_index = _YearCache(self._compile_workday_prefix)
+        # 休息/工作连续区间索引 (起始年, 结束年, starts, runs)，首次使用时
+        # 编译今年和明年，之后按需向两侧扩展
+        self._holiday_runs: Optional[
+            Tuple[int, int, List[int], List[Tuple[int, int, bool]]]] = None
         self._anniversaries = anniversaries or {}  # 自定义纪念日
-        self.db = HolidayDB(HOLIDAY_DB_FILE)  # 初始化数据库备份
+        self._anniversaries_config = self._anniversaries
+        self._anniversaries_file = anniversaries_file
+        # 纪念日文件的修改时间，文件不存在时为 None；初始为哨兵值，
+        # 保证首次检查一定执行（路径写错时也会记录一次警告）
+        self._anniversaries_mtime: Any = _MTIME_UNCHECKED
+        # 启动时一次性编译纪念日配置并建立索引
+        self._anniversary_index = AnniversaryIndex(
+            compile_anniversaries(self._anniversaries))
+        self.reload_anniversaries()
+        # 持久化存储，默认使用组件目录下的 SQLite 数据库
+        self.db = db if db is not None else HolidayDB(HOLIDAY_DB_FILE)
 
         self.session = requests.Session()
         # 设置重试策略和 Headers
@@ -685,6 +1714,14 @@ class Holiday:
         # 初始化时尝试从本地磁盘加载缓存的节假日数据
         self.get_holidays_from_disk()
 
+        # 预热今明两年的节日缓存
+        this_year = Holiday.today().year
+        years = (this_year, this_year + 1)
+        _WEEKDAY_FESTIVAL_CACHE.prewarm(years)
+        _LUNAR_FESTIVAL_CACHE.prewarm(years)
+        self._festival_index.prewarm(years)
+        self._status_index.prewarm(years)
+
     @classmethod
     def day(cls, n: int) -> datetime.datetime:
         """获取相对于今天的第 n 天的日期对象。
@@ -722,8 +1759,8 @@ class Holiday:
         """
         current_year = str(today.year)
         next_year = str(today.year + 1)
-        target_years = [y for y in self._holiday_json if y in (
-            current_year, next_year)]
+        target_years = [y for y in (current_year, next_year)
+                        if y in self._holiday_json or y in self._pending_years]
         candidates = []
 
         # 将 timezone-aware 的 today 转换为 naive datetime 以便比较
@@ -737,7 +1774,7 @@ class Holiday:
             hour=0, minute=0, second=0, microsecond=0)
 
         for y in target_years:
-            dates = self._holiday_json[y]
+            dates = self._get_year_data(y)
             if not isinstance(dates, dict):
                 continue
             for m_d, item in dates.items():
@@ -849,34 +1886,56 @@ class Holiday:
         if not self._holiday_json:
             self.get_holidays_from_server()
 
-        # 将 timezone-aware 的 today 转换为 naive datetime 以便比较
-        if today.tzinfo is not None:
-            today_naive = today.replace(tzinfo=None)
-        else:
-            today_naive = today
+        today_date = today.date()
+        first = today_date + timedelta(days=min_days)
+        last = today_date + timedelta(days=max_days)
 
-        # 重置为 00:00:00 以便按日期计算天数差
-        today_naive = today_naive.replace(
-            hour=0, minute=0, second=0, microsecond=0)
-
-        candidates = self._collect_holiday_candidates(today)
+        # 库中的法定节假日按 (type, day_int) 索引一次查出，同时带出完整字段
+        found = None
+        row = self.db.next_of_type(2, first)
+        if row:
+            try:
+                date = datetime_class.strptime(row["day"], "%Y%m%d").date()
+            except (KeyError, TypeError, ValueError):
+                date = None
+            # 以内存数据为准，核对不一致时忽略库中的结果
+            if date is not None and date <= last and \
+                    self.is_holiday_status(date) == 2:
+                found = (date, row)
+                last = date - timedelta(days=1)
+
+        # 内置数据只在内存中，库中结果之前的日期再按状态数组查找
+        date = self._find_status(2, first, last)
+        if date is not None:
+            found = (date, None)
+        if found is None:
+            return None
 
-        for date in candidates:
-            days_diff = (date - today_naive).days
-            if not (min_days <= days_diff <= max_days):
-                continue
+        date, detail = found
+        year_data = self._get_year_data(date.year)
+        holiday_item = {}
+        if isinstance(year_data, dict) and isinstance(
+                year_data.get(date.strftime("%m%d")), dict):
+            holiday_item = year_data[date.strftime("%m%d")]
+        return {
+            "date": date.strftime("%Y-%m-%d"),
+            "name": holiday_item.get("typename") or (detail or {}).get(
+                "typename") or "未知节假日",
+            "days_diff": (date - today_date).days,
+            "full_info": self._get_full_item(date, holiday_item, detail),
+        }
 
-            # 查找节假日的完整信息
-            year = str(date.year)
-            month_day = date.strftime("%m%d")
-            if year in self._holiday_json and month_day in self._holiday_json[year]:
-                holiday_item = self._holiday_json[year][month_day]
-                return {
-                    "date": date.strftime("%Y-%m-%d"),
-                    "name": holiday_item.get("typename", "未知节假日"),
-                    "days_diff": days_diff,
-                    "full_info": holiday_item,
-                }
+    def _find_status(
+        self, status: int, first: datetime.date, last: datetime.date
+    ) -> Optional[datetime.date]:
+        """在 first..last（含）中查找第一个指定状态码的日期。"""
+        for year in range(first.year, last.year + 1):
+            start = datetime.date(year, 1, 1).toordinal()
+            lo = max(first.toordinal(), start) - start
+            hi = min(last.toordinal(), datetime.date(year, 12, 31).toordinal()) - start
+            index = self._status_index.get(year).find(status, lo, hi + 1)
+            if index >= 0:
+                return datetime.date.fromordinal(start + index)
         return None
 
     def get_nearest_festival(
@@ -884,6 +1943,8 @@ class Holiday:
     ) -> Optional[Dict[str, Any]]:
         """获取最近一次节日（含法定、公历、农历、纪念日）的详细信息对象。
 
+        法定、公历、农历及按星期计算的节日来自按年编译的节日索引，二分查找得到结果。
+
         Args:
             min_days: 最小查找天数范围。
             max_days: 最大查找天数范围。
@@ -896,120 +1957,131 @@ class Holiday:
         if not self._holiday_json:
             self.get_holidays_from_server()
 
-        # 将 timezone-aware 的 today 转换为 naive datetime 以便比较
-        if today.tzinfo is not None:
-            today_naive = today.replace(tzinfo=None)
-        else:
-            today_naive = today
-
-        # 重置为 00:00:00 以便按日期计算天数差
-        today_naive = today_naive.replace(
-            hour=0, minute=0, second=0, microsecond=0)
+        today_date = today.date()
+        today_ordinal = today_date.toordinal()
+        first = today_date + timedelta(days=min_days)
+        last = today_date + timedelta(days=max_days)
+
+        best = None
+
+        # 1. 法定节假日 (priority=1)、公历/农历/星期节日 (priority=2)
+        for year in range(first.year, last.year + 1):
+            entries = self._get_festival_index(year)
+            idx = bisect_left(entries, (first.toordinal(),))
+            if idx < len(entries) and entries[idx][0] <= last.toordinal():
+                ordinal, priority, _, name, full_info = entries[idx]
+                if priority == 1:
+                    # 法定节假日在索引中只保存精简记录，完整信息按需读取
+                    full_info = self._get_full_item(
+                        datetime.date.fromordinal(ordinal), full_info)
+                best = {
+                    "date": datetime.date.fromordinal(ordinal).strftime("%Y-%m-%d"),
+                    "name": name,
+                    "days_diff": ordinal - today_ordinal,
+                    "full_info": full_info,
+                    "priority": priority,
+                }
+                break
 
-        all_candidates = []
+        # 2. 自定义纪念日 (priority=0)，同一天时优先于其他节日
+        if anniversaries is None:
+            anniversaries = self.get_future_anniversaries(today)
 
-        # 1. 收集法定节假日候选日期 (priority=1)
-        statutory_candidates = self._collect_holiday_candidates(today)
-        for date in statutory_candidates:
-            days_diff = (date - today_naive).days
-            if not (min_days <= days_diff <= max_days):
+        for item in anniversaries:
+            try:
+                days_diff = item['days_diff']
+                if not min_days <= days_diff <= max_days:
+                    continue
+                if best is not None and (days_diff, 0) >= (
+                        best["days_diff"], best["priority"]):
+                    continue
+                d_dt = datetime_class.strptime(item['date'], "%Y-%m-%d")
+                best = {
+                    "date": d_dt.strftime("%Y-%m-%d"),
+                    "name": item['name'],
+                    "days_diff": days_diff,
+                    "full_info": {"festival": [item['name']]},
+                    "priority": 0
+                }
+            except Exception:
                 continue
 
-            year = str(date.year)
-            month_day = date.strftime("%m%d")
-            if year in self._holiday_json and month_day in self._holiday_json[year]:
-                holiday_item = self._holiday_json[year][month_day]
-                all_candidates.append({
-                    "date": date.strftime("%Y-%m-%d"),
-                    "name": holiday_item.get("typename", "未知节假日"),
-                    "days_diff": days_diff,
-                    "full_info": holiday_item,
-                    "priority": 1
-                })
+        return best
 
-        # 2. 收集公历节日 (priority=2)
-        for date_str, names in _SOLAR_FESTIVAL.items():
-            month = int(date_str[:2])
-            day = int(date_str[2:])
-            try:
-                # 尝试今年
-                d = datetime_class(today_naive.year, month, day)
-                if d < today_naive:
-                    # 如果已过，尝试明年
-                    d = datetime_class(today_naive.year + 1, month, day)
-
-                days_diff = (d - today_naive).days
-                if min_days <= days_diff <= max_days:
-                    all_candidates.append({
-                        "date": d.strftime("%Y-%m-%d"),
-                        "name": names[0],
-                        "days_diff": days_diff,
-                        "full_info": {"festival": names},
-                        "priority": 2
-                    })
-            except ValueError:
-                continue
+    def _get_full_item(
+        self, date, item: Any, detail: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """从数据库读取某天的完整记录，读取不到时返回内存中的精简记录。
 
-        # 3. 收集农历节日 (priority=2)
-        for date_str, names in _LUNAR_FESTIVAL.items():
-            month = int(date_str[:2])
-            day = int(date_str[2:])
-            try:
-                # 获取今天的农历年份
-                ld_today = LunarDate.fromSolarDate(
-                    today_naive.year, today_naive.month, today_naive.day)
-
-                # 尝试今年的农历日期
-                d = LunarDate.toSolarDate(ld_today.year, month, day)
-                d_dt = datetime_class(d.year, d.month, d.day)
-
-                if d_dt < today_naive:
-                    # 如果已过，尝试明年
-                    d = LunarDate.toSolarDate(ld_today.year + 1, month, day)
-                    d_dt = datetime_class(d.year, d.month, d.day)
-
-                days_diff = (d_dt - today_naive).days
-                if min_days <= days_diff <= max_days:
-                    all_candidates.append({
-                        "date": d_dt.strftime("%Y-%m-%d"),
-                        "name": names[0],
-                        "days_diff": days_diff,
-                        "full_info": {"festival": names},
-                        "priority": 2
-                    })
-            except Exception:
-                continue
+        农历相关字段不落库，与 get_day_detail 一样在这里本地补齐。
+        已查出的完整记录可通过 detail 传入，避免重复查询。
+        """
+        if detail is None:
+            detail = self.db.get_day_detail(date.strftime("%Y%m%d"))
+        else:
+            detail = dict(detail)
+        if not detail:
+            if not isinstance(item, dict):
+                return item
+            detail = dict(item)
+        for key, value in self.get_lunar_info(date).items():
+            if not detail.get(key):
+                detail[key] = value
+        return detail
 
-        # 4. 收集自定义纪念日 (priority=0)
-        if anniversaries is None:
-            anniversaries = self.get_future_anniversaries(today)
+    def _get_festival_index(self, year: int) -> List[Tuple[int, int, int, str, Any]]:
+        """获取某公历年的节日索引，首次使用时编译。"""
+        return self._festival_index.get(year)
 
-        for item in anniversaries:
+    def _compile_festival_index(self, year: int) -> List[Tuple[int, int, int, str, Any]]:
+        """编译某公历年的节日索引。
+
+        索引为按 (公历序数, 优先级, 序号) 排序的列表，合并了法定节假日、
+        公历节日、农历节日和按星期计算的节日。
+        """
+        entries = []
+
+        # 法定节假日
+        year_data = self._get_year_data(year)
+        if isinstance(year_data, dict):
+            for m_d, item in year_data.items():
+                if not self._is_holiday_item(item):
+                    continue
+                date = self._parse_holiday_date(item, str(year), m_d)
+                if date is None:
+                    continue
+                name = item.get("typename", "未知节假日") if isinstance(
+                    item, dict) else "未知节假日"
+                entries.append((date.toordinal(), 1, name, item))
+
+        # 公历节日
+        for date_str, names in _SOLAR_FESTIVAL.items():
             try:
-                d_dt = datetime_class.strptime(item['date'], "%Y-%m-%d")
-                days_diff = item['days_diff']
-                if min_days <= days_diff <= max_days:
-                    all_candidates.append({
-                        "date": d_dt.strftime("%Y-%m-%d"),
-                        "name": item['name'],
-                        "days_diff": days_diff,
-                        "full_info": {"festival": [item['name']]},
-                        "priority": 0
-                    })
-            except Exception:
+                d = datetime.date(year, int(date_str[:2]), int(date_str[2:]))
+            except ValueError:
                 continue
+            entries.append((d.toordinal(), 2, names[0], {"festival": names}))
 
-        if not all_candidates:
-            return None
+        # 农历节日
+        for date_str, names in _build_lunar_festival(year).items():
+            d = datetime.date(year, int(date_str[:2]), int(date_str[2:]))
+            entries.append((d.toordinal(), 2, names[0], {"festival": names}))
 
-        # 排序：先按天数差（从小到大），再按优先级（从小到大，越小越高）
-        all_candidates.sort(key=lambda x: (x['days_diff'], x['priority']))
+        # 按星期计算的节日（母亲节、感恩节等）
+        for date_str, names in _build_weekday_festival(year).items():
+            d = datetime.date(year, int(date_str[:2]), int(date_str[2:]))
+            entries.append((d.toordinal(), 2, names[0], {"festival": names}))
 
-        return all_candidates[0]
+        return sorted(
+            (ordinal, priority, seq, name, full_info)
+            for seq, (ordinal, priority, name, full_info) in enumerate(entries)
+        )
 
     def get_nearest_jieqi(self, min_days: int = 0, max_days: int = 60) -> Optional[Dict[str, Any]]:
         """获取最近一次节气的详细信息。
 
+        节气由本地天文算法计算，不依赖网络与数据库。
+
         Args:
             min_days: 最小查找天数范围。
             max_days: 最大查找天数范围。
@@ -1018,166 +2090,144 @@ class Holiday:
             Optional[Dict]: 包含节气详细信息的字典，无结果时返回 None。
         """
         today = Holiday.today()
-        if not self._holiday_json:
-            self.get_holidays_from_server()
-
-        if today.tzinfo is not None:
-            today_naive = today.replace(tzinfo=None)
-        else:
-            today_naive = today
-        
-        today_naive = today_naive.replace(hour=0, minute=0, second=0, microsecond=0)
-
-        for n in range(min_days, max_days + 1):
-            target_date = today_naive + timedelta(days=n)
-            detail = self.get_day_detail(target_date)
-            jieqi = detail.get("jieqi")
-            if jieqi:
-                return {
-                    "date": target_date.strftime("%Y-%m-%d"),
-                    "name": jieqi,
-                    "days_diff": n
-                }
-        return None
+        today_date = today.date()
 
-    def get_anniversaries(self, date: datetime.datetime) -> List[str]:
-        """获取指定日期的自定义纪念日。
-
-        支持的配置格式（key）：
-        - "YYYY-MM-DD": 公历一次性纪念日（仅在该日期触发）
-        - "MM-DD": 公历每年纪念日
-        - "nYYYY-MM-DD": 农历一次性纪念日
-        - "nMM-DD": 农历每年纪念日
-        """
-        anniversaries = []
-
-        # 公历部分
-        g_year = date.year
-        g_month = date.month
-        g_day = date.day
-
-        # 农历部分
-        ld = LunarDate.fromSolarDate(g_year, g_month, g_day)
-        l_year = ld.year
-        l_month = ld.month
-        l_day = ld.day
+        found = JieQi.next(today_date + timedelta(days=min_days))
+        if not found:
+            return None
+        jieqi_date, name = found
+        days_diff = (jieqi_date - today_date).days
+        if days_diff > max_days:
+            return None
+        return {
+            "date": jieqi_date.strftime("%Y-%m-%d"),
+            "name": name,
+            "days_diff": days_diff
+        }
 
-        for key, value in self._anniversaries.items():
-            if not key:
-                continue
+    def reload_anniversaries(self) -> bool:
+        """检查外部纪念日文件，修改时间变化时重新编译纪念日索引。
 
-            # 判断 Key 类型
-            is_lunar = key.startswith('n')
-            clean_key = key[1:] if is_lunar else key
+        新索引编译完成后整体替换，节假日数据、数据库连接和节日缓存均不受影响。
 
+        Returns:
+            bool: 是否重新加载了纪念日。
+        """
+        path = self._anniversaries_file
+        if not path:
+            return False
+        try:
+            mtime: Optional[float] = os.path.getmtime(path)
+        except OSError:
+            mtime = None
+        if mtime == self._anniversaries_mtime:
+            return False
+        self._anniversaries_mtime = mtime
+
+        file_data: Dict[str, str] = {}
+        if mtime is None:
+            _LOGGER.warning("纪念日文件不存在: %s", path)
+        else:
             try:
-                parts = [int(p) for p in clean_key.split('-')]
-            except ValueError:
-                continue
+                file_data = load_anniversaries_file(path)
+            except Exception as e:
+                _LOGGER.error("加载纪念日文件 %s 失败: %s", path, e)
+                return False
 
-            if is_lunar:
-                # 农历匹配
-                if len(parts) == 3:  # nYYYY-MM-DD
-                    if parts[0] == l_year and parts[1] == l_month and parts[2] == l_day:
-                        anniversaries.append(value)
-                elif len(parts) == 2:  # nMM-DD
-                    if parts[0] == l_month and parts[1] == l_day:
-                        anniversaries.append(value)
-            else:
-                # 公历匹配
-                if len(parts) == 3:  # YYYY-MM-DD
-                    if parts[0] == g_year and parts[1] == g_month and parts[2] == g_day:
-                        anniversaries.append(value)
-                elif len(parts) == 2:  # MM-DD
-                    if parts[0] == g_month and parts[1] == g_day:
-                        anniversaries.append(value)
+        anniversaries = dict(self._anniversaries_config)
+        anniversaries.update(file_data)
+        index = AnniversaryIndex(compile_anniversaries(anniversaries))
+        self._anniversaries = anniversaries
+        self._anniversary_index = index
+        _LOGGER.info("纪念日已重新加载，共 %d 条", len(index))
+        return True
 
-        return anniversaries
+    def get_anniversaries(self, date: datetime.datetime) -> List[str]:
+        """获取指定日期的自定义纪念日。
+
+        配置格式见 compile_anniversaries，匹配基于初始化时建立的纪念日索引。
+        """
+        try:
+            lunar = LunarDate.fromSolarDate(date.year, date.month, date.day)
+        except ValueError:
+            lunar = None
+        return self._anniversary_index.match(date, lunar)
 
     def get_future_anniversaries(
         self, date: datetime.datetime
     ) -> List[Dict[str, Any]]:
-        today = date.date()
-        items: List[Dict[str, Any]] = []
+        """获取从指定日期开始的未来纪念日列表（含倒计时），按时间排序。
 
-        # 获取今天的农历年份，用于计算每年重复的农历纪念日
-        try:
-            ld_today = LunarDate.fromSolarDate(
-                today.year, today.month, today.day)
-            current_lunar_year = ld_today.year
-        except Exception:
-            current_lunar_year = today.year  # Fallback
+        结果来自增量维护的纪念日排程，只有日期推进后已过期的条目会被重新计算。
+        """
+        return self._anniversary_index.schedule.upcoming(date.date())
 
-        for key, value in self._anniversaries.items():
-            if not value:
-                continue
-            try:
-                target_date = None
-
-                # 处理农历配置 (以 'n' 开头)
-                if key.startswith('n'):
-                    clean_key = key[1:]
-                    parts = [int(p) for p in clean_key.split('-')]
-
-                    if len(parts) == 3:  # nYYYY-MM-DD (一次性)
-                        l_year, l_month, l_day = parts
-                        try:
-                            target_date = LunarDate.toSolarDate(
-                                l_year, l_month, l_day)
-                            if target_date < today:
-                                continue
-                        except ValueError:
-                            continue
-
-                    elif len(parts) == 2:  # nMM-DD (每年)
-                        l_month, l_day = parts
-                        # 尝试今年的农历日期
-                        try:
-                            t1 = LunarDate.toSolarDate(
-                                current_lunar_year, l_month, l_day)
-                            if t1 >= today:
-                                target_date = t1
-                            else:
-                                # 如果今年的已经过了，计算明年的
-                                target_date = LunarDate.toSolarDate(
-                                    current_lunar_year + 1, l_month, l_day)
-                        except ValueError:
-                            continue
-
-                # 处理公历配置
-                elif len(key) == 5 and key[2] == "-":  # MM-DD (每年)
-                    month, day = key.split("-")
-                    target_year = today.year
-                    target_date = datetime.date(
-                        target_year, int(month), int(day)
-                    )
-                    if target_date < today:
-                        target_date = datetime.date(
-                            target_year + 1, int(month), int(day)
-                        )
-                else:  # YYYY-MM-DD (一次性)
-                    target_date = datetime_class.strptime(
-                        key, "%Y-%m-%d").date()
-                    if target_date < today:
-                        continue
+    def _compile_holiday_runs(
+        self, first: int, last: int
+    ) -> Tuple[List[int], List[Tuple[int, int, bool]]]:
+        """把 first..last 年的逐日状态压缩为按时间排序的连续区间。
 
-                if target_date:
-                    items.append(
-                        {
-                            "name": value,
-                            "date": target_date.strftime("%Y-%m-%d"),
-                            "days_diff": (target_date - today).days,
-                        }
-                    )
-            except Exception:
-                continue
-        items.sort(key=lambda x: x["days_diff"])
-        return items
+        Returns:
+            (starts, runs)：starts 为各区间起始序数，用于二分查找；
+            runs 为 (起始序数, 结束序数, 是否休息) 列表，相邻区间类型交替。
+        """
+        starts: List[int] = []
+        runs: List[Tuple[int, int, bool]] = []
+        for year in range(first, last + 1):
+            ordinal = datetime.date(year, 1, 1).toordinal()
+            for offset, status in enumerate(self._status_index.get(year)):
+                rest = status != 0
+                if runs and runs[-1][2] == rest:
+                    runs[-1] = (runs[-1][0], ordinal + offset, rest)
+                else:
+                    starts.append(ordinal + offset)
+                    runs.append((ordinal + offset, ordinal + offset, rest))
+        return starts, runs
+
+    def _find_run(self, ordinal: int) -> Optional[Tuple[int, int, bool]]:
+        """查找包含指定序数的连续区间。
+
+        索引起初只覆盖今年和明年，区间触及索引边界时才向该侧扩展一年，
+        避免为编译索引把数据库中的年份全部加载进内存。扩展不超出已知
+        年份前后一年，超出范围时返回 None。
+        """
+        year = datetime.date.fromordinal(ordinal).year
+        if self._holiday_runs is None:
+            this_year = self.today().year
+            self._holiday_runs = (this_year, this_year + 1) + \
+                self._compile_holiday_runs(this_year, this_year + 1)
+        first, last, starts, runs = self._holiday_runs
+        known = [int(y) for y in self._known_years()] or [first]
+        lower, upper = min(min(known) - 1, first), max(max(known) + 1, last)
+        if not lower <= year <= upper:
+            return None
+        while True:
+            i = bisect_right(starts, ordinal) - 1
+            if 0 < i < len(runs) - 1 and ordinal <= runs[i][1]:
+                return runs[i]
+            new_first, new_last = first, last
+            if i <= 0 and first > lower:
+                new_first = max(lower, min(first - 1, year - 1))
+            if i >= len(runs) - 1 and last < upper:
+                new_last = min(upper, max(last + 1, year + 1))
+            if (new_first, new_last) == (first, last):
+                return None
+            first, last = new_first, new_last
+            self._holiday_runs = (first, last) + \
+                self._compile_holiday_runs(first, last)
+            starts, runs = self._holiday_runs[2:]
 
     def _find_holiday_range(
         self, date: datetime.datetime
     ) -> Tuple[datetime.datetime, datetime.datetime]:
         """查找连续假期的开始和结束日期。"""
+        run = self._find_run(date.toordinal())
+        if run is not None and run[2]:
+            ordinal = date.toordinal()
+            return (date + timedelta(days=run[0] - ordinal),
+                    date + timedelta(days=run[1] - ordinal))
+
+        # 不在索引范围内时逐日查找
         start = date
         end = date
         # 向前查找
@@ -1192,10 +2242,27 @@ class Holiday:
         self, date: datetime.datetime, look_back: bool = True
     ) -> List[Dict[str, Any]]:
         """查找节假日周边连续的工作日（调休）。"""
-        workdays = []
-        current = date - \
-            timedelta(days=1) if look_back else date + timedelta(days=1)
         step = -1 if look_back else 1
+        run = self._find_run(date.toordinal() + step)
+        if run is not None:
+            if run[2]:
+                return []
+            # 只取 date 一侧、直到区间端点的工作日
+            ordinal = date.toordinal()
+            if look_back:
+                offsets = range(run[0] - ordinal, 0)
+            else:
+                offsets = range(1, run[1] - ordinal + 1)
+            workdays = []
+            for offset in offsets:
+                current = date + timedelta(days=offset)
+                workdays.append(
+                    {"date": current, "invert": current.weekday() in (5, 6)})
+            return workdays
+
+        # 不在索引范围内时逐日查找
+        workdays = []
+        current = date + timedelta(days=step)
 
         while self.is_holiday_status(current) == 0:
             # 判断是否为调休（即本该是周末但变成了工作日）
@@ -1254,31 +2321,129 @@ class Holiday:
     def get_holidays_from_disk(self) -> None:
         """从本地加载节假日数据。
 
-        优先从 SQLite 数据库加载，如果数据库为空，再尝试从 JSON 文件加载。
+        SQLite 数据库是唯一的持久化存储；旧版本留下的 JSON 缓存文件
+        会先导入数据库再停用。
         """
-        loaded = False
+        self._migrate_legacy_files()
 
-        # 1. 优先尝试从数据库加载
+        # 只读取年份索引，逐年数据按需加载
+        data: Dict[str, Any] = {}
+        years: Iterable[str] = ()
         try:
-            db_data = self.db.load()
-            if db_data:
-                self._holiday_json = db_data
-                loaded = True
-                _LOGGER.debug("从 SQLite 数据库加载数据成功")
+            index = self.db.load_index()
+            if "update_time" in index:
+                data["update_time"] = index["update_time"]
+            years = index.get("years", ())
+            _LOGGER.debug("从 SQLite 数据库加载年份索引成功")
         except Exception as e:
             _LOGGER.error("从 SQLite 数据库加载数据失败: %s", e)
 
-        # 2. 如果数据库没有数据，尝试从 JSON 文件加载
-        if not loaded:
-            try:
-                if os.path.exists(HOLIDAY_DATA_FILE):
-                    with open(HOLIDAY_DATA_FILE, "r", encoding="utf-8") as f:
-                        self._holiday_json = json.load(f)
-                        loaded = True
-                        _LOGGER.info("从 JSON 文件加载数据成功")
-            except Exception as e:
-                _LOGGER.error("加载本地 JSON 数据失败: %s", e)
-                self._holiday_json = {}
+        # 数据库为空时（首次安装）仍会合并内置的节假日安排
+        self._set_holiday_data(data, years)
+        this_year = Holiday.today().year
+        for year in range(this_year - self._preload_years,
+                          this_year + self._preload_years + 1):
+            self._get_year_data(year)
+
+    def _migrate_legacy_files(self) -> None:
+        """一次性迁移：把旧版本的 JSON 缓存导入数据库，随后改名停用。
+
+        数据库中已有的日期不会被覆盖；导入失败时保留原文件，下次启动重试。
+        """
+        path = HOLIDAY_DATA_FILE
+        if not os.path.exists(path):
+            return
+        try:
+            data = self._read_legacy_json(path)
+            items = []
+            for y_str, year_data in data.items():
+                if not str(y_str).isdigit() or not isinstance(year_data, dict):
+                    continue
+                for m_d, item in year_data.items():
+                    if not isinstance(item, dict):
+                        item = {"type": item}
+                    item = dict(item)
+                    item.setdefault("day", "{}{}".format(y_str, m_d))
+                    items.append(item)
+            count = self.db.import_missing(items, data.get("update_time"))
+            os.replace(path, path + ".migrated")
+            _LOGGER.info("已将 %s 迁移到数据库 (新增 %d 行)", path, count)
+        except Exception as e:
+            _LOGGER.error("迁移旧数据文件 %s 失败: %s", path, e)
+
+    @staticmethod
+    def _read_legacy_json(path: str) -> Dict[str, Any]:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _set_holiday_data(
+        self,
+        data: Dict[str, Any],
+        pending_years: Iterable[str] = (),
+        keep_loaded: bool = False,
+    ) -> None:
+        """替换内存中的节假日数据，并清空依赖它的派生索引。
+
+        派生索引在释放 _year_load_lock 之后再清空：索引构建时持有缓存锁
+        并可能按需加载年份，两把锁必须按同一顺序获取。
+
+        Args:
+            data: {"update_time": str, year: {mmdd: item}}。
+            pending_years: 数据库中已有、首次访问时再加载的年份。
+            keep_loaded: 为 True 时保留 data 中没有、但已加载的年份，
+                并沿用当前的待加载年份（忽略 pending_years）。
+        """
+        with self._year_load_lock:
+            if keep_loaded:
+                for y_str, year_data in self._holiday_json.items():
+                    data.setdefault(y_str, year_data)
+                pending_years = self._pending_years
+            self._holiday_json = data
+            self._pending_years = {
+                str(y) for y in pending_years if str(y) not in data}
+            # 待加载的年份在加载时再合并内置数据
+            for y_str in self._seed:
+                if y_str in self._pending_years:
+                    continue
+                if not isinstance(data.get(y_str), dict):
+                    data[y_str] = {}
+                self._apply_seed(y_str, data[y_str])
+        self._festival_index.clear()
+        self._status_index.clear()
+        self._workday_index.clear()
+        self._holiday_runs = None
+
+    def _get_year_data(self, year) -> Optional[Dict[str, Any]]:
+        """获取某年的数据 {mmdd: item}，尚未加载时从数据库读取。"""
+        y_str = str(year)
+        if y_str in self._pending_years:
+            with self._year_load_lock:
+                if y_str in self._pending_years:
+                    year_data = self.db.load_year(
+                        y_str, HolidayDB.SUMMARY_FIELDS)
+                    self._apply_seed(y_str, year_data)
+                    self._holiday_json[y_str] = year_data
+                    self._pending_years.discard(y_str)
+        return self._holiday_json.get(y_str)
+
+    def _apply_seed(self, y_str: str, year_data: Dict[str, Any]) -> None:
+        """用内置数据补齐某年中没有任何数据的月份，已有数据的月份保持不变。"""
+        seed = self._seed.get(y_str)
+        if not seed:
+            return
+        months = {m_d[:2] for m_d in year_data}
+        for m_d, item in seed.items():
+            if m_d[:2] not in months:
+                year_data[m_d] = dict(item)
+
+    def _stored_months(self, y_str: str) -> set:
+        """数据库中已有逐日详情的月份 (MM)。"""
+        return {m_d[:2] for m_d in self.db.load_year(y_str, ["type"])}
+
+    def _known_years(self) -> List[str]:
+        """返回已加载或可从数据库加载的年份。"""
+        years = {y for y in self._holiday_json if str(y).isdigit()}
+        return sorted(years | self._pending_years)
 
     def get_holidays_from_server(self, days: int = 15) -> None:
         """从服务器获取节假日数据。
@@ -1286,8 +2451,6 @@ class Holiday:
         Args:
             days: 缓存有效期天数。
         """
-        os.makedirs(os.path.dirname(HOLIDAY_DATA_FILE), exist_ok=True)
-
         # 检查是否需要更新
         last_update_str = self._holiday_json.get("update_time", "2020-01-01")
         try:
@@ -1305,10 +2468,7 @@ class Holiday:
 
         # 检查是否包含当前年份的数据，如果没有数据，即使时间没过期也应该更新
         current_year_str = str(today.year)
-        has_data = (
-            current_year_str in self._holiday_json
-            and self._holiday_json[current_year_str]
-        )
+        has_data = bool(self._get_year_data(current_year_str))
 
         _LOGGER.debug(
             "距上次更新 %s 天, 阈值 %s 天, 是否有当前年份数据: %s",
@@ -1321,6 +2481,16 @@ class Holiday:
             _LOGGER.debug("无需更新")
             return
 
+        # 首次安装时今年已由内置数据覆盖：把内置数据的载入时间当作更新时间，
+        # SEED_REFRESH_DELAY 内各实体的首次取值都不联网，之后再补齐未来月份与宜忌
+        if days != 0 and "update_time" not in self._holiday_json \
+                and current_year_str in self._seed:
+            if self._seeded_at is None:
+                self._seeded_at = today_naive
+            if today_naive - self._seeded_at < SEED_REFRESH_DELAY:
+                _LOGGER.debug("今年已由内置数据覆盖，暂不联网更新")
+                return
+
         # 执行更新
         _LOGGER.info("开始更新节假日数据(强制刷新)...")
         new_data = self._holiday_json.copy()
@@ -1331,29 +2501,56 @@ class Holiday:
         full_data_items: List[Dict[str, Any]] = []
 
         # 获取当前月及未来 5 个月的数据
+        stored_months: Dict[str, set] = {}
+        copied_years: set = set()
+        fetched = 0
         for i in range(6):
             # 计算年月
             y, m = self._get_year_month(today, i)
 
             y_str = str(y)
-            if y_str not in new_data:
-                new_data[y_str] = {}
+            # 内置数据已覆盖且库中已有详情（宜忌等）的月份无需联网
+            if y_str in self._seed:
+                if y_str not in stored_months:
+                    stored_months[y_str] = self._stored_months(y_str)
+                if "{:0>2d}".format(m) in stored_months[y_str]:
+                    continue
+
+            if y_str not in copied_years:
+                # 尚未从数据库加载的年份先载入，避免覆盖其他月份；
+                # 修改副本，查询线程在替换前仍读取原数据
+                new_data[y_str] = dict(self._get_year_data(y_str) or {})
+                copied_years.add(y_str)
 
             # 获取数据，并填充 simple dict 和 full list
-            self._fetch_month_data(y, m, new_data[y_str], full_data_items)
+            month_dict: Dict[str, Any] = {}
+            self._fetch_month_data(y, m, month_dict, full_data_items)
+            fetched += 1
+            if month_dict:
+                # 以接口数据替换该月已有的数据（包括内置数据）
+                year_dict = new_data[y_str]
+                prefix = "{:0>2d}".format(m)
+                for m_d in [k for k in year_dict if k[:2] == prefix]:
+                    del year_dict[m_d]
+                year_dict.update(month_dict)
             time.sleep(0.5)  # 礼貌延时，避免触发API频率限制
 
-        # 保存数据
-        try:
-            # 1. 保存到 JSON (仅包含简略信息，保持兼容)
-            with open(HOLIDAY_DATA_FILE, "w", encoding="utf-8") as f:
-                json.dump(new_data, f, ensure_ascii=False, indent=2)
+        # 所有月份都获取失败时不推进更新时间，下次更新时重试
+        if fetched and not full_data_items:
+            _LOGGER.warning("获取节假日数据失败，将在下次更新时重试")
+            return
 
-            # 2. 备份到 SQLite (包含全量信息)
-            self.db.save_full(full_data_items, update_time_str)
+        # 保存数据：全量信息只写入 SQLite
+        try:
+            counts = self.db.save_full(full_data_items, update_time_str)
+            _LOGGER.debug(
+                "数据库写入: 新增 %d 行, 更新 %d 行, 未变化 %d 行",
+                counts["inserted"], counts["updated"], counts["unchanged"],
+            )
 
-            self._holiday_json = new_data
-            _LOGGER.info("节假日数据更新完成 (JSON + SQLite)")
+            # 复制之后其他线程可能又按需加载了年份，替换时一并保留
+            self._set_holiday_data(new_data, keep_loaded=True)
+            _LOGGER.info("节假日数据更新完成")
         except Exception as e:
             _LOGGER.error("保存数据失败: %s", e)
 
@@ -1380,7 +2577,7 @@ class Holiday:
         Args:
             year: 年份
             month: 月份
-            year_dict: 用于内存使用的字典 {day: full_item_dict}
+            year_dict: 用于内存使用的字典 {day: summary_item_dict}
             full_data_list: 用于数据库存储的全量数据列表
         """
         d = "{}{:0>2d}".format(year, month)
@@ -1420,11 +2617,18 @@ class Holiday:
 
                     date_obj = datetime_class(year, month, day_int)
                     item.update(self.get_festival_info(date_obj))
+                    # 农历相关字段由 get_day_detail 本地计算，不再存储
+                    for key in _LOCAL_DETAIL_FIELDS:
+                        item.pop(key, None)
 
                     # 只要是 休息日(1)、节假日(2) 或 调休上班日(周末且type=0)
                     if t in (1, 2) or (t == 0 and w in (6, 7)):
-                        # 修改：存储完整对象，保持 JSON 和 数据库 一致
-                        year_dict[day_key] = item
+                        # 内存只保存精简字段，完整对象写入数据库
+                        year_dict[day_key] = {
+                            key: item[key]
+                            for key in HolidayDB.SUMMARY_FIELDS
+                            if key in item
+                        }
 
                     # 2. 收集全量数据 (数据库用)
                     if full_data_list is not None:
@@ -1446,23 +2650,45 @@ class Holiday:
         y_str = str(date.year)
         m_d_key = "{:0>2d}{:0>2d}".format(date.month, date.day)
 
-        detail: Dict[str, Any] = {}
-        if y_str in self._holiday_json:
-            if (
-                isinstance(self._holiday_json[y_str], dict)
-                and m_d_key in self._holiday_json[y_str]
+        # 完整字段只保存在数据库中，内存里的精简记录作为兜底
+        detail: Dict[str, Any] = self.db.get_day_detail(day_key)
+        if not detail:
+            year_data = self._get_year_data(y_str)
+            if isinstance(year_data, dict) and isinstance(
+                year_data.get(m_d_key), dict
             ):
-                item = self._holiday_json[y_str][m_d_key]
-                if isinstance(item, dict):
-                    detail = dict(item)
+                detail = dict(year_data[m_d_key])
 
-        if not detail:
-            detail = self.db.get_day_detail(day_key) or detail
+        # 农历、干支、生肖、节气等字段本地计算，存储数据中的非空值优先
+        for key, value in self.get_lunar_info(date).items():
+            if not detail.get(key):
+                detail[key] = value
 
         festival_info = self.get_festival_info(date)
         detail.update(festival_info)
         return detail
 
+    def get_lunar_info(self, date: datetime.datetime) -> Dict[str, Any]:
+        """本地计算某天的农历相关字段，格式与 API 返回一致。
+
+        Returns:
+            Dict: 包含 yearname (干支年), shengxiao (生肖),
+            nonglicn (中文农历月日), nongli (农历 YYYYMMDD), jieqi (节气)。
+            超出农历数据支持范围时返回空字典。
+        """
+        try:
+            ld = LunarDate.fromSolarDate(date.year, date.month, date.day)
+            jieqi = JieQi.fromSolarDate(date.year, date.month, date.day)
+        except ValueError:
+            return {}
+        return {
+            "yearname": ld.ganzhiYear(),
+            "shengxiao": ld.shengxiao(),
+            "nonglicn": ld.toChinese(),
+            "nongli": "{}{:0>2d}{:0>2d}".format(ld.year, ld.month, ld.day),
+            "jieqi": jieqi,
+        }
+
     def get_festival_info(self, date: datetime.datetime) -> Dict[str, Any]:
         solar = _festival_handle(_SOLAR_FESTIVAL, date.month, date.day)
         weekday_map = _build_weekday_festival(date.year)
@@ -1470,9 +2696,8 @@ class Holiday:
         weekday = weekday_map.get(weekday_key, [])
         solar_all = solar + weekday
 
-        lunar = LunarDate.fromSolarDate(date.year, date.month, date.day)
         lunar_festival = _festival_handle(
-            _LUNAR_FESTIVAL, lunar.month, lunar.day)
+            _build_lunar_festival(date.year), date.month, date.day)
 
         # 获取自定义纪念日
         anniversaries = self.get_anniversaries(date)
@@ -1490,6 +2715,35 @@ class Holiday:
             "festival": combined,
         }
 
+    def _compile_status_array(self, year: int) -> bytearray:
+        """编译某公历年的逐日状态数组。
+
+        先按星期填充默认值（周六、周日为 1），再用节假日数据覆盖。
+        """
+        start = datetime.date(year, 1, 1)
+        days = datetime.date(year + 1, 1, 1).toordinal() - start.toordinal()
+        # 1 月 1 日为周几决定了周末的起始下标
+        first = start.weekday()
+        status = bytearray(
+            1 if (first + i) % 7 >= 5 else 0 for i in range(days))
+
+        year_data = self._get_year_data(year)
+        if not isinstance(year_data, dict):
+            return status
+        for m_d, item in year_data.items():
+            try:
+                # 兼容处理：如果是字典，取type字段；如果是数字，直接使用
+                if isinstance(item, dict):
+                    value = int(item.get("type", 0))
+                else:
+                    value = int(item)
+                index = datetime.date(
+                    year, int(m_d[:2]), int(m_d[2:])).toordinal() - start.toordinal()
+                status[index] = value
+            except (TypeError, ValueError) as e:
+                _LOGGER.debug("忽略无效的节假日数据 %s%s: %s", year, m_d, e)
+        return status
+
     def is_holiday_status(self, date: datetime.datetime) -> int:
         """获取某天的状态码。
 
@@ -1500,25 +2754,69 @@ class Holiday:
         if not self._holiday_json:
             self.get_holidays_from_server()
 
-        y_str = str(date.year)
-        m_d_key = "{:0>2d}{:0>2d}".format(date.month, date.day)
+        # 按年内第几天直接索引，未收录的日期已按星期预先填充
+        year = date.year
+        status = self._status_index.get(year)
+        return status[date.toordinal() - datetime.date(year, 1, 1).toordinal()]
 
-        # 优先查表
-        if y_str in self._holiday_json:
-            if (
-                isinstance(self._holiday_json[y_str], dict)
-                and m_d_key in self._holiday_json[y_str]
-            ):
-                item = self._holiday_json[y_str][m_d_key]
-                # 兼容处理：如果是字典，取type字段；如果是数字，直接返回
-                if isinstance(item, dict):
-                    return int(item.get("type", 0))
-                return int(item)
+    def _compile_workday_prefix(self, year: int) -> array:
+        """编译某公历年的工作日前缀和，长度为当年天数 + 1。"""
+        status = self._status_index.get(year)
+        return array("H", accumulate((1 if s == 0 else 0 for s in status), initial=0))
 
-        # 查不到则默认按星期判断
-        if date.weekday() >= 5:  # 5=Sat, 6=Sun
-            return 1
-        return 0
+    def _workday_prefix(self, date: datetime.datetime) -> Tuple[array, int]:
+        """返回日期所在年份的工作日前缀和及该日期在年内的下标。"""
+        if not self._holiday_json:
+            self.get_holidays_from_server()
+        prefix = self._workday_index.get(date.year)
+        return prefix, date.toordinal() - datetime.date(date.year, 1, 1).toordinal()
+
+    def workdays_between(self, start: datetime.datetime, end: datetime.datetime) -> int:
+        """计算 [start, end) 区间内的工作日天数。
+
+        end 早于 start 时返回负数，即 -workdays_between(end, start)。
+        """
+        if end < start:
+            return -self.workdays_between(end, start)
+        start_prefix, start_index = self._workday_prefix(start)
+        end_prefix, end_index = self._workday_prefix(end)
+        if start.year == end.year:
+            return end_prefix[end_index] - start_prefix[start_index]
+        count = start_prefix[-1] - start_prefix[start_index] + end_prefix[end_index]
+        for year in range(start.year + 1, end.year):
+            count += self._workday_index.get(year)[-1]
+        return count
+
+    def add_workdays(self, date: datetime.datetime, n: int):
+        """计算 date 之后第 n 个工作日（n 为负数时为之前第 |n| 个）。
+
+        date 本身不计入；n 为 0 时原样返回。返回值与 date 类型相同。
+        """
+        if n == 0:
+            return date
+        prefix, index = self._workday_prefix(date)
+        year = date.year
+        if n > 0:
+            # 目标为当年第 k 个工作日，不足时转入下一年
+            k = prefix[index + 1] + n
+            while k > prefix[-1]:
+                k -= prefix[-1]
+                year += 1
+                prefix = self._workday_index.get(year)
+        else:
+            k = prefix[index] + n + 1
+            while k < 1:
+                year -= 1
+                prefix = self._workday_index.get(year)
+                k += prefix[-1]
+        # 第 k 个工作日的下标即前缀和首次达到 k 的位置减一
+        ordinal = datetime.date(year, 1, 1).toordinal() + \
+            bisect_left(prefix, k) - 1
+        return date + timedelta(days=ordinal - date.toordinal())
+
+    def next_workday(self, date: datetime.datetime):
+        """获取 date 之后的下一个工作日。"""
+        return self.add_workdays(date, 1)
 
     def is_holiday(self, date: datetime.datetime) -> str:
         """获取某天的状态描述文本。"""
@@ -86,6 +86,8 @@ class HolidayCombinedSensor(SensorEntity):
         try:
             # 检查是否需要更新数据
             self._engine.get_holidays_from_server()
+            # 外部纪念日文件有修改时热加载
+            self._engine.reload_anniversaries()
 
             # 获取今天和明天的日期
             today = self._engine.day(0)
@@ -0,0 +1,216 @@
+"""JDM Holiday 基于 Home Assistant Store 的存储后端。
+
+数据保存在 Home Assistant 配置目录的 `.storage/jdm_holiday` 中，
+更新组件（例如 HACS 覆盖组件目录）不会丢失缓存。
+启动时异步读取一次，之后的写入在延迟窗口内合并为一次落盘。
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .holiday_engine import HOLIDAY_DB_FILE, HolidayDB
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = "jdm_holiday"
+STORAGE_VERSION = 1
+# 延迟写入窗口（秒），窗口内的多次保存只写一次
+SAVE_DELAY = 10
+# 列表类型的字段，与 HolidayDB 读取结果保持一致（缺省为空列表）
+_LIST_FIELDS = ("solar_festival", "lunar_festival", "festival")
+
+
+class HolidayStore:
+    """实现 Holiday 所用 HolidayDB 接口的 Store 后端。
+
+    数据在内存中按 {year: {mmdd: item}} 组织，方法可在执行器线程中调用；
+    保存请求通过事件循环交给 Store.async_delay_save 合并执行。
+    Store 只能整体读写，因此宜忌等完整字段也常驻内存（每年约数百 KB），
+    这是换取异步读写与合并落盘的代价；SQLite 后端只在内存中保留精简字段。
+    """
+
+    def __init__(self, hass: HomeAssistant, store: Store, data: Optional[Dict[str, Any]]):
+        self._hass = hass
+        self._store = store
+        self._lock = threading.Lock()
+        data = data or {}
+        self._update_time: Optional[str] = data.get("update_time")
+        self._years: Dict[str, Dict[str, Dict[str, Any]]] = data.get("years", {})
+
+    @staticmethod
+    def _normalize(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """只保留 holiday_detail 对应的字段，无效日期返回 None。"""
+        day = item.get("day")
+        if not isinstance(day, str) or len(day) != 8 or not day.isdigit():
+            return None
+        return {
+            key: item[key]
+            for key in HolidayDB.COLUMNS
+            if item.get(key) is not None
+        }
+
+    @staticmethod
+    def _to_item(
+        record: Dict[str, Any], fields: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        """转换为与 HolidayDB 相同形式的数据项。"""
+        if fields is None:
+            keys = HolidayDB.COLUMNS
+        else:
+            keys = ["day"] + [f for f in fields if f != "day"]
+        item = {key: record.get(key) for key in keys}
+        for key in _LIST_FIELDS:
+            if key in item:
+                item[key] = list(item[key] or [])
+        return item
+
+    def _schedule_save(self) -> None:
+        """请求延迟保存，可在任意线程调用。"""
+        self._hass.loop.call_soon_threadsafe(self._async_delay_save)
+
+    @callback
+    def _async_delay_save(self) -> None:
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "update_time": self._update_time,
+                "years": {y: dict(days) for y, days in self._years.items()},
+            }
+
+    def _put(self, items: List[Dict[str, Any]], overwrite: bool) -> Dict[str, int]:
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+        for item in items:
+            record = self._normalize(item)
+            if record is None:
+                continue
+            days = self._years.setdefault(record["day"][:4], {})
+            old = days.get(record["day"][4:])
+            if old is None:
+                counts["inserted"] += 1
+            elif not overwrite or old == record:
+                counts["unchanged"] += 1
+                continue
+            else:
+                counts["updated"] += 1
+            days[record["day"][4:]] = record
+        return counts
+
+    def save_full(
+        self, data_list: List[Dict[str, Any]], update_time: str
+    ) -> Dict[str, int]:
+        """保存全量数据列表，返回新增、更新、未变化的行数。"""
+        with self._lock:
+            self._update_time = update_time
+            counts = self._put(data_list, overwrite=True)
+        self._schedule_save()
+        return counts
+
+    def import_missing(
+        self, data_list: List[Dict[str, Any]], update_time: Optional[str]
+    ) -> int:
+        """导入尚不存在的日期，已有数据与更新时间保持不变。"""
+        with self._lock:
+            if update_time and not self._update_time:
+                self._update_time = update_time
+            count = self._put(data_list, overwrite=False)["inserted"]
+        self._schedule_save()
+        return count
+
+    def load_index(self) -> Dict[str, Any]:
+        with self._lock:
+            data: Dict[str, Any] = {}
+            if self._update_time:
+                data["update_time"] = self._update_time
+            years = sorted(y for y, days in self._years.items() if days)
+            if years:
+                data["years"] = years
+            return data
+
+    @staticmethod
+    def _check_fields(fields: Optional[Iterable[str]]) -> Optional[List[str]]:
+        """校验要读取的字段，与 HolidayDB 一样拒绝未知列名。"""
+        if fields is None:
+            return None
+        fields = list(fields)
+        unknown = [f for f in fields if f not in HolidayDB.COLUMNS]
+        if unknown:
+            raise ValueError("未知字段: {}".format(", ".join(unknown)))
+        return fields
+
+    def load_year(
+        self, year: str, fields: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        fields = self._check_fields(fields)
+        with self._lock:
+            days = self._years.get(str(year), {})
+            return {
+                m_d: self._to_item(record, fields)
+                for m_d, record in sorted(days.items())
+            }
+
+    def get_day_detail(self, day_str: str) -> Dict[str, Any]:
+        with self._lock:
+            record = self._years.get(day_str[:4], {}).get(day_str[4:])
+            return self._to_item(record) if record else {}
+
+    def get_range(
+        self, start, end, fields: Optional[Iterable[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """按日期范围查询数据，按日期升序返回。"""
+        fields = self._check_fields(fields)
+        first, last = start.strftime("%Y%m%d"), end.strftime("%Y%m%d")
+        items = []
+        with self._lock:
+            for year in range(start.year, end.year + 1):
+                for m_d, record in sorted(self._years.get(str(year), {}).items()):
+                    if first <= record["day"] <= last:
+                        items.append(self._to_item(record, fields))
+        return items
+
+    def next_of_type(self, day_type: int, start) -> Dict[str, Any]:
+        """查找 start（含）之后第一个指定类型的日期，如 2=节假日。"""
+        first = start.strftime("%Y%m%d")
+        with self._lock:
+            for year in sorted(y for y in self._years if y >= first[:4]):
+                for m_d, record in sorted(self._years[year].items()):
+                    if record["day"] >= first and \
+                            str(record.get("type")) == str(day_type):
+                        return self._to_item(record)
+        return {}
+
+    def close(self) -> None:
+        """Store 会在 Home Assistant 退出前写入待保存的数据，这里无需处理。"""
+
+
+async def async_create_store(hass: HomeAssistant) -> HolidayStore:
+    """读取 Store 数据并创建存储后端。
+
+    Store 为空且组件目录下存在旧的 SQLite 数据库时，先把其中的数据导入。
+    """
+    store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+    data = await store.async_load()
+    backend = HolidayStore(hass, store, data)
+    if not data and os.path.exists(HOLIDAY_DB_FILE):
+        await hass.async_add_executor_job(_import_sqlite, backend)
+    return backend
+
+
+def _import_sqlite(backend: HolidayStore) -> None:
+    db = HolidayDB(HOLIDAY_DB_FILE)
+    try:
+        index = db.load_index()
+        items = []
+        for year in index.get("years", []):
+            items.extend(db.load_year(year).values())
+        count = backend.import_missing(items, index.get("update_time"))
+        _LOGGER.info("已从 SQLite 数据库导入 %d 天数据到 Store", count)
+    finally:
+        db.close()
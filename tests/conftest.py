@@ -0,0 +1,55 @@
+import sys
+import os
+import copy
+import datetime
+
+import pytest
+
+# Add custom_components/jdm_holiday to path to import holiday_engine directly
+# This avoids triggering __init__.py which depends on homeassistant
+sys.path.append(
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "../custom_components/jdm_holiday")
+    )
+)
+
+import holiday_engine
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """把引擎的数据库、旧 JSON 缓存与内置数据路径指向临时目录。"""
+    monkeypatch.setattr(holiday_engine, "HOLIDAY_DB_FILE",
+                        str(tmp_path / "data.db"))
+    monkeypatch.setattr(holiday_engine, "HOLIDAY_DATA_FILE",
+                        str(tmp_path / "holiday.json"))
+    monkeypatch.setattr(holiday_engine, "HOLIDAY_SEED_FILE",
+                        str(tmp_path / "holiday_seed.json"))
+    return tmp_path
+
+
+# 测试用的逐日数据：一个法定节假日和一个调休上班日
+HOLIDAY_ITEMS = [
+    {"day": "20261001", "status": 1, "type": 2, "typename": "国庆节",
+     "festival": ["国庆节"], "suit": "祭祀 出行"},
+    {"day": "20261010", "status": 0, "type": 0, "typename": "补班"},
+]
+
+
+@pytest.fixture
+def holiday_items():
+    """每个测试独立的一份 HOLIDAY_ITEMS。"""
+    return copy.deepcopy(HOLIDAY_ITEMS)
+
+
+@pytest.fixture
+def freeze_today(monkeypatch):
+    """返回把 Holiday.today() 固定到指定日期（当天 9 点）的函数。"""
+
+    def freeze(year, month, day):
+        now = datetime.datetime(
+            year, month, day, 9, tzinfo=datetime.timezone.utc)
+        monkeypatch.setattr(holiday_engine.Holiday, "day", classmethod(
+            lambda cls, n: now + datetime.timedelta(days=n)))
+
+    return freeze
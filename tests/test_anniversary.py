@@ -0,0 +1,156 @@
+import datetime
+import json
+import logging
+
+import pytest
+
+import holiday_engine
+from holiday_engine import (
+    ANNIVERSARY_LUNAR_ONCE,
+    ANNIVERSARY_LUNAR_YEARLY,
+    ANNIVERSARY_SOLAR_ONCE,
+    ANNIVERSARY_SOLAR_YEARLY,
+    AnniversaryIndex,
+    AnniversarySchedule,
+    Holiday,
+    LunarDate,
+    compile_anniversaries,
+)
+
+
+ANNIVERSARIES = {
+    "05-20": "纪念日",
+    "2026-10-01": "一次性",
+    "n08-15": "中秋",
+    "n1990-01-01": "生日",
+}
+
+
+def _engine(anniversaries):
+    engine = Holiday.__new__(Holiday)
+    engine._anniversaries = anniversaries
+    engine._anniversary_index = AnniversaryIndex(
+        compile_anniversaries(anniversaries))
+    return engine
+
+
+def test_compile_anniversaries_kinds():
+    rules = compile_anniversaries(ANNIVERSARIES)
+    assert [r.kind for r in rules] == [
+        ANNIVERSARY_SOLAR_YEARLY,
+        ANNIVERSARY_SOLAR_ONCE,
+        ANNIVERSARY_LUNAR_YEARLY,
+        ANNIVERSARY_LUNAR_ONCE,
+    ]
+    assert (rules[3].year, rules[3].month, rules[3].day) == (1990, 1, 1)
+
+
+def test_compile_anniversaries_skips_invalid(caplog):
+    rules = compile_anniversaries(
+        {"13-01": "a", "abc": "b", "n01-31": "c", "01-01": "", "02-29": "d"})
+    assert [r.name for r in rules] == ["d"]
+    assert caplog.text.count("忽略无效的纪念日配置") == 3
+
+
+def test_get_anniversaries_matches_solar_and_lunar():
+    engine = _engine(ANNIVERSARIES)
+    assert engine.get_anniversaries(datetime.datetime(2027, 5, 20)) == ["纪念日"]
+    assert engine.get_anniversaries(datetime.datetime(2026, 10, 1)) == ["一次性"]
+    # 2026 年中秋为 9 月 25 日
+    assert engine.get_anniversaries(datetime.datetime(2026, 9, 25)) == ["中秋"]
+    assert engine.get_anniversaries(datetime.datetime(1990, 1, 27)) == ["生日"]
+
+
+def test_get_future_anniversaries_sorted():
+    engine = _engine(ANNIVERSARIES)
+    items = engine.get_future_anniversaries(datetime.datetime(2026, 9, 26))
+    assert items == [
+        {"name": "一次性", "date": "2026-10-01", "days_diff": 5},
+        {"name": "纪念日", "date": "2027-05-20", "days_diff": 236},
+        {"name": "中秋", "date": "2027-09-15", "days_diff": 354},
+    ]
+
+
+def test_anniversary_index_keeps_config_order():
+    index = AnniversaryIndex(compile_anniversaries({
+        "n08-15": "中秋",
+        "2026-09-25": "一次性",
+        "09-25": "每年",
+    }))
+    date = datetime.date(2026, 9, 25)
+    lunar = LunarDate.fromSolarDate(2026, 9, 25)
+    assert index.match(date, lunar) == ["中秋", "一次性", "每年"]
+    assert index.match(date, None) == ["一次性", "每年"]
+
+
+def test_schedule_only_reschedules_passed_entries(monkeypatch):
+    rules = compile_anniversaries(ANNIVERSARIES)
+    schedule = AnniversarySchedule(rules)
+    first = schedule.upcoming(datetime.date(2026, 9, 26))
+    assert [item["name"] for item in first] == ["一次性", "纪念日", "中秋"]
+
+    calls = []
+    original = type(rules[0]).next_occurrence
+
+    def spy(rule, today, lunar_year):
+        calls.append(rule.name)
+        return original(rule, today, lunar_year)
+
+    monkeypatch.setattr(type(rules[0]), "next_occurrence", spy)
+    assert schedule.upcoming(datetime.date(2026, 9, 26)) == first
+    assert calls == []
+
+    items = schedule.upcoming(datetime.date(2026, 10, 2))
+    assert calls == []  # 一次性纪念日过期后直接移除
+    assert [item["name"] for item in items] == ["纪念日", "中秋"]
+    assert items[0]["days_diff"] == 230
+
+
+def test_lunar_yearly_skips_years_without_the_day():
+    # 农历 2024 至 2028 年腊月均只有 29 天，下一个腊月三十在 2030-02-02
+    rules = compile_anniversaries({"n12-30": "腊月三十"})
+    target = rules[0].next_occurrence(datetime.date(2025, 1, 1), 2024)
+    assert target == datetime.date(2030, 2, 2)
+
+
+def test_reload_anniversaries_file(data_dir):
+    path = data_dir / "anniversaries.json"
+    path.write_text(json.dumps({"05-20": "文件纪念日"}), encoding="utf-8")
+
+    engine = Holiday({"05-20": "配置纪念日", "06-01": "儿童节"},
+                     anniversaries_file=str(path))
+    assert engine.get_anniversaries(
+        datetime.datetime(2027, 5, 20)) == ["文件纪念日"]
+    assert engine.reload_anniversaries() is False
+
+    index = engine._anniversary_index
+    path.write_text("key,name\n07-01,建党节\n", encoding="utf-8")
+    csv_path = path.rename(data_dir / "anniversaries.csv")
+    engine._anniversaries_file = str(csv_path)
+    assert engine.reload_anniversaries() is True
+    assert engine._anniversary_index is not index
+    assert engine.get_anniversaries(
+        datetime.datetime(2027, 5, 20)) == ["配置纪念日"]
+    assert engine.get_anniversaries(datetime.datetime(2027, 7, 1)) == ["建党节"]
+
+
+def test_missing_anniversaries_file_warns_once(data_dir, caplog):
+    path = str(data_dir / "missing.yaml")
+    with caplog.at_level(logging.WARNING):
+        engine = Holiday({"05-20": "配置纪念日"}, anniversaries_file=path)
+    assert [r.getMessage() for r in caplog.records] == [
+        "纪念日文件不存在: {}".format(path)]
+    assert engine.get_anniversaries(
+        datetime.datetime(2027, 5, 20)) == ["配置纪念日"]
+    caplog.clear()
+    assert engine.reload_anniversaries() is False
+    assert caplog.records == []
+
+
+def test_load_anniversaries_yaml(tmp_path):
+    if holiday_engine.yaml is None:
+        pytest.skip("PyYAML not installed")
+    path = tmp_path / "anniversaries.yaml"
+    path.write_text('"n08-15": 中秋\n"2026-05-20": 纪念日\n', encoding="utf-8")
+    assert holiday_engine.load_anniversaries_file(str(path)) == {
+        "n08-15": "中秋", "2026-05-20": "纪念日"}
@@ -0,0 +1,270 @@
+import os
+import datetime
+import json
+import threading
+import time
+
+import pytest
+
+import holiday_engine
+from holiday_engine import Holiday, HolidayDB
+
+
+def test_connection_is_reused_per_thread(tmp_path):
+    db = HolidayDB(str(tmp_path / "data.db"))
+    conn = db._get_conn()
+    assert db._get_conn() is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    other = []
+    t = threading.Thread(target=lambda: other.append(db._get_conn()))
+    t.start()
+    t.join()
+    assert other[0] is not conn
+
+    db.close()
+    assert db._get_conn() is not conn
+    db.close()
+
+
+def test_save_and_load_round_trip(tmp_path, holiday_items):
+    db = HolidayDB(str(tmp_path / "data.db"))
+    db.save_full(holiday_items, "2026-10-18")
+
+    data = db.load()
+    assert data["update_time"] == "2026-10-18"
+    assert data["2026"]["1001"]["typename"] == "国庆节"
+    assert data["2026"]["1001"]["festival"] == ["国庆节"]
+    assert "row_hash" not in data["2026"]["1001"]
+    assert db.get_day_detail("20261010")["type"] == 0
+    assert db.get_day_detail("20261011") == {}
+    db.close()
+
+
+def test_save_full_skips_unchanged_rows(tmp_path, holiday_items):
+    db = HolidayDB(str(tmp_path / "data.db"))
+    assert db.save_full(holiday_items, "2026-10-18") == {
+        "inserted": 2, "updated": 0, "unchanged": 0}
+    assert db.save_full(holiday_items, "2026-10-19") == {
+        "inserted": 0, "updated": 0, "unchanged": 2}
+
+    changed = [dict(holiday_items[0], typename="国庆"), holiday_items[1],
+               {"day": "20261011", "type": 1}]
+    assert db.save_full(changed, "2026-10-20") == {
+        "inserted": 1, "updated": 1, "unchanged": 1}
+    data = db.load()
+    assert data["update_time"] == "2026-10-20"
+    assert data["2026"]["1001"]["typename"] == "国庆"
+    db.close()
+
+
+def test_engine_loads_years_lazily(data_dir, holiday_items, freeze_today):
+    db_file = holiday_engine.HOLIDAY_DB_FILE
+    db = HolidayDB(db_file)
+    db.save_full(holiday_items + [{"day": "20200101", "type": 2, "typename": "元旦"}],
+                 "2026-10-18")
+    db.close()
+    assert db.load_index() == {"update_time": "2026-10-18",
+                               "years": ["2020", "2026"]}
+    assert list(db.load_year("2020")) == ["0101"]
+    assert db.load_year("2026", ["type"])["1001"] == {
+        "day": "20261001", "type": 2}
+    with pytest.raises(ValueError):
+        db.load_year("2026", ["type; DROP TABLE holiday_detail"])
+    db.close()
+
+    freeze_today(2026, 9, 28)
+    engine = Holiday()
+    # 只预加载今年前后的数据，2020 年在首次访问时加载
+    assert "2026" in engine._holiday_json
+    assert engine._pending_years == {"2020"}
+    # 编译连续区间索引不会加载其他年份
+    assert engine._find_holiday_range(datetime.datetime(2026, 10, 1)) == (
+        datetime.datetime(2026, 10, 1), datetime.datetime(2026, 10, 1))
+    assert engine._holiday_runs[:2] == (2026, 2027)
+    assert engine._pending_years == {"2020"}
+    assert engine.is_holiday_status(datetime.datetime(2020, 1, 1)) == 2
+    assert engine._pending_years == set()
+    assert engine._holiday_json["2020"]["0101"]["typename"] == "元旦"
+
+    # 内存中只保留精简字段，完整信息在查询详情时从数据库读取
+    assert set(engine._holiday_json["2026"]["1001"]) <= set(
+        HolidayDB.SUMMARY_FIELDS)
+    detail = engine.get_day_detail(datetime.datetime(2026, 10, 1))
+    assert detail["suit"] == "祭祀 出行"
+    assert engine.get_nearest_statutory_holiday()["full_info"]["suit"] == \
+        "祭祀 出行"
+    engine.db.close()
+
+
+def test_range_and_indexed_next_queries(tmp_path, holiday_items):
+    db = HolidayDB(str(tmp_path / "data.db"))
+    db.save_full(holiday_items + [{"day": "20261008", "type": 0, "jieqi": "寒露"},
+                          {"day": "20270101", "type": 2, "typename": "元旦"}],
+                 "2026-10-18")
+
+    days = db.get_range(datetime.date(2026, 10, 1),
+                        datetime.date(2026, 10, 31), fields=["type"])
+    assert days == [{"day": "20261001", "type": 2},
+                    {"day": "20261008", "type": 0},
+                    {"day": "20261010", "type": 0}]
+    assert db.next_of_type(2, datetime.date(2026, 10, 2))["typename"] == "元旦"
+
+    plan = db._get_conn().execute(
+        "EXPLAIN QUERY PLAN SELECT day FROM holiday_detail "
+        "WHERE type = 2 AND day_int >= 20261002 ORDER BY day_int LIMIT 1"
+    ).fetchall()
+    assert "idx_holiday_detail_type" in str([tuple(r) for r in plan])
+    db.close()
+
+
+def test_nearest_statutory_holiday_uses_indexed_query(
+        data_dir, holiday_items, freeze_today):
+    db = HolidayDB(holiday_engine.HOLIDAY_DB_FILE)
+    db.save_full(holiday_items, "2026-09-01")
+    db.close()
+    freeze_today(2026, 9, 20)
+    engine = Holiday()
+    result = engine.get_nearest_statutory_holiday()
+    assert (result["date"], result["name"], result["days_diff"]) == (
+        "2026-10-01", "国庆节", 11)
+    assert result["full_info"]["suit"] == "祭祀 出行"
+    assert result["full_info"]["nonglicn"] == "八月廿一"
+    assert engine.get_nearest_statutory_holiday(max_days=10) is None
+
+    # 只在内存中的节假日（如内置数据）早于库中结果时优先
+    engine._holiday_json["2026"]["0925"] = {
+        "day": "20260925", "type": 2, "typename": "中秋节"}
+    engine._status_index.clear()
+    result = engine.get_nearest_statutory_holiday()
+    assert (result["date"], result["name"]) == ("2026-09-25", "中秋节")
+    engine.db.close()
+
+
+def test_legacy_files_are_migrated_once(data_dir, holiday_items):
+    json_file = data_dir / "holiday.json"
+    db = HolidayDB(holiday_engine.HOLIDAY_DB_FILE)
+    db.save_full(holiday_items, "2026-09-01")
+    db.close()
+    json_file.write_text(json.dumps({
+        "update_time": "2025-01-01",
+        "2025": {"0101": {"day": "20250101", "type": 2, "typename": "元旦"},
+                 "0405": 2},
+        "2026": {"1001": {"day": "20261001", "type": 2, "typename": "旧数据"}},
+    }), encoding="utf-8")
+
+    engine = Holiday()
+    assert not json_file.exists()
+    assert os.path.exists(str(json_file) + ".migrated")
+    # 库中已有的数据与更新时间不被旧文件覆盖
+    assert engine._holiday_json["update_time"] == "2026-09-01"
+    assert engine.db.get_day_detail("20261001")["suit"] == "祭祀 出行"
+    assert engine.db.get_day_detail("20250101")["typename"] == "元旦"
+    assert engine.is_holiday_status(datetime.datetime(2025, 4, 5)) == 2
+    engine.db.close()
+
+
+def test_refresh_writes_only_to_database(data_dir, monkeypatch, holiday_items):
+    monkeypatch.setattr(holiday_engine.time, "sleep", lambda s: None)
+
+    def fake_fetch(self, year, month, year_dict, full_data_list=None):
+        if (year, month) == (2026, 10):
+            item = dict(holiday_items[0])
+            year_dict["1001"] = {"day": "20261001", "type": 2}
+            full_data_list.append(item)
+
+    monkeypatch.setattr(Holiday, "_fetch_month_data", fake_fetch)
+    engine = Holiday()
+    engine.get_holidays_from_server(days=0)
+    assert not any(name.startswith("holiday")
+                   for name in os.listdir(str(data_dir)))
+    assert engine.db.get_day_detail("20261001")["suit"] == "祭祀 出行"
+    assert engine.is_holiday_status(datetime.datetime(2026, 10, 1)) == 2
+    engine.db.close()
+
+
+def test_refresh_keeps_years_loaded_during_fetch(data_dir, monkeypatch):
+    db = HolidayDB(holiday_engine.HOLIDAY_DB_FILE)
+    db.save_full([{"day": "20200101", "type": 2, "typename": "元旦"}],
+                 "2026-01-01")
+    db.close()
+    monkeypatch.setattr(holiday_engine.time, "sleep", lambda s: None)
+    engine = Holiday()
+    assert "2020" in engine._pending_years
+
+    def fake_fetch(self, year, month, year_dict, full_data_list=None):
+        # 刷新期间其他线程按需加载了 2020 年
+        self._get_year_data("2020")
+        full_data_list.append({"day": "{}{:0>2d}01".format(year, month),
+                               "type": 0})
+
+    monkeypatch.setattr(Holiday, "_fetch_month_data", fake_fetch)
+    engine.get_holidays_from_server(days=0)
+    assert engine.is_holiday_status(datetime.datetime(2020, 1, 1)) == 2
+    engine.db.close()
+
+
+def test_data_swap_does_not_deadlock_with_index_build(data_dir, monkeypatch):
+    db = HolidayDB(holiday_engine.HOLIDAY_DB_FILE)
+    db.save_full([{"day": "20350501", "type": 2, "typename": "劳动节"}],
+                 "2026-01-01")
+    db.close()
+    building = threading.Event()
+    compile_status = Holiday._compile_status_array
+
+    def slow_compile(self, year):
+        # 持有缓存锁时放慢构建，让替换数据先拿到年份加载锁
+        building.set()
+        time.sleep(0.2)
+        return compile_status(self, year)
+
+    monkeypatch.setattr(Holiday, "_compile_status_array", slow_compile)
+    engine = Holiday()
+    assert "2035" in engine._pending_years
+
+    def swap():
+        building.wait()
+        engine._set_holiday_data(dict(engine._holiday_json), keep_loaded=True)
+
+    threads = [
+        threading.Thread(target=engine.is_holiday_status,
+                         args=(datetime.date(2035, 5, 1),), daemon=True),
+        threading.Thread(target=swap, daemon=True),
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(3)
+    assert not any(t.is_alive() for t in threads)
+    assert engine.is_holiday_status(datetime.date(2035, 5, 1)) == 2
+    engine.db.close()
+
+
+def test_schema_migrations_upgrade_legacy_db_once(tmp_path, monkeypatch):
+    import sqlite3
+
+    db_file = str(tmp_path / "data.db")
+    conn = sqlite3.connect(db_file)
+    # 早期版本的表：没有节日列、哈希列与整数日期列
+    conn.execute("CREATE TABLE meta_info (key TEXT PRIMARY KEY, value TEXT)")
+    conn.execute("CREATE TABLE holiday_detail (day TEXT PRIMARY KEY, {})".format(
+        ", ".join(c + " TEXT" for c in HolidayDB.COLUMNS[1:-3])))
+    conn.execute("INSERT INTO holiday_detail (day, type, typename) "
+                 "VALUES ('20261001', 2, '国庆节')")
+    conn.commit()
+    conn.close()
+
+    db = HolidayDB(db_file)
+    conn = db._get_conn()
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == \
+        HolidayDB.SCHEMA_VERSION
+    columns = {r[1] for r in conn.execute("PRAGMA table_info(holiday_detail)")}
+    assert {"festival", "row_hash", "day_int"} <= columns
+    assert db.next_of_type(2, datetime.date(2026, 1, 1))["typename"] == "国庆节"
+    db.close()
+
+    calls = []
+    monkeypatch.setattr(HolidayDB, "_ensure_columns",
+                        lambda self, *args: calls.append(args))
+    HolidayDB(db_file).close()
+    assert calls == []
@@ -0,0 +1,239 @@
+import os
+import datetime
+import types
+
+import pytest
+
+import holiday_engine
+from holiday_engine import Holiday
+
+
+@pytest.fixture
+def engine(data_dir):
+    """不联网、数据文件位于临时目录的引擎实例。"""
+    engine = Holiday()
+    engine._set_holiday_data({
+        "update_time": Holiday.today().strftime("%Y-%m-%d"),
+        "2026": {
+            "1001": {"day": "20261001", "type": 2, "typename": "国庆节"},
+        },
+    })
+    return engine
+
+
+def test_day_detail_computes_lunar_fields_without_stored_data(engine):
+    detail = engine.get_day_detail(datetime.datetime(2030, 2, 3))
+    assert detail["yearname"] == "庚戌"
+    assert detail["shengxiao"] == "狗"
+    assert detail["nonglicn"] == "正月初一"
+    assert detail["nongli"] == "20300101"
+    assert "春节" in detail["festival"]
+
+
+def test_day_detail_keeps_stored_fields(engine):
+    detail = engine.get_day_detail(datetime.datetime(2026, 10, 1))
+    assert detail["typename"] == "国庆节"
+    assert detail["nonglicn"] == "八月廿一"
+
+
+def test_nearest_festival_uses_year_index(engine, freeze_today):
+    freeze_today(2026, 9, 26)
+    # 法定节假日与公历节日同一天时，法定节假日优先
+    result = engine.get_nearest_festival(min_days=3, anniversaries=[])
+    assert result["date"] == "2026-10-01"
+    assert result["name"] == "国庆节"
+    assert result["priority"] == 1
+    # 跨年查找农历节日（2027 年春节为 2 月 6 日）
+    freeze_today(2026, 12, 31)
+    result = engine.get_nearest_festival(min_days=30, anniversaries=[])
+    assert (result["date"], result["name"]) == ("2027-01-30", "小年")
+
+
+def test_full_info_includes_local_lunar_fields(engine, freeze_today):
+    freeze_today(2026, 9, 26)
+    results = [
+        engine.get_nearest_statutory_holiday(min_days=3),
+        engine.get_nearest_festival(min_days=3, anniversaries=[]),
+    ]
+    for result in results:
+        full_info = result["full_info"]
+        assert full_info["typename"] == "国庆节"
+        for key in ("yearname", "shengxiao", "nonglicn", "nongli"):
+            assert full_info[key]
+        assert full_info["nonglicn"] == "八月廿一"
+
+
+def test_nearest_festival_prefers_anniversary_on_same_day(
+        engine, freeze_today):
+    freeze_today(2026, 9, 26)
+    anniversaries = [{"name": "纪念日", "date": "2026-10-01", "days_diff": 5}]
+    result = engine.get_nearest_festival(
+        min_days=3, anniversaries=anniversaries)
+    assert (result["name"], result["priority"]) == ("纪念日", 0)
+
+
+def test_year_cache_is_bounded_and_builds_each_year_once():
+    import threading
+
+    calls = []
+
+    def builder(year):
+        calls.append(year)
+        return {"year": year}
+
+    cache = holiday_engine._YearCache(builder, maxsize=2)
+    threads = [threading.Thread(target=cache.get, args=(2026,))
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert calls == [2026]
+
+    cache.get(2027)
+    cache.get(2026)  # 2026 变为最近使用
+    cache.get(2028)  # 淘汰 2027
+    cache.get(2027)
+    assert calls == [2026, 2027, 2028, 2027]
+
+
+def test_lunar_festival_skips_leap_month():
+    # 2025 年闰六月，农历节日只落在正常月份
+    festivals = holiday_engine._build_lunar_festival(2025)
+    assert festivals["0531"] == ["端午节"]
+    assert festivals["1006"] == ["中秋节"]
+    assert "0128" in festivals  # 除夕（腊月廿九）
+
+
+def test_status_array_matches_data_and_weekends(engine):
+    engine._set_holiday_data({
+        "update_time": Holiday.today().strftime("%Y-%m-%d"),
+        "2026": {
+            "1001": {"day": "20261001", "type": 2, "typename": "国庆节"},
+            "1010": {"day": "20261010", "type": 0},  # 周六调休上班
+            "1231": 2,
+        },
+    })
+    assert engine.is_holiday_status(datetime.datetime(2026, 10, 1)) == 2
+    assert engine.is_holiday_status(datetime.datetime(2026, 10, 10)) == 0
+    assert engine.is_holiday_status(datetime.datetime(2026, 10, 11)) == 1
+    assert engine.is_holiday_status(datetime.datetime(2026, 10, 12)) == 0
+    assert engine.is_holiday_status(datetime.datetime(2026, 12, 31)) == 2
+    # 无数据的闰年按星期判断
+    assert engine.is_holiday_status(datetime.datetime(2028, 12, 31)) == 1
+    assert len(engine._status_index.get(2028)) == 366
+
+    # 数据刷新后状态数组随之重建
+    engine._set_holiday_data({"update_time": "2026-10-18", "2026": {}})
+    assert engine.is_holiday_status(datetime.datetime(2026, 10, 1)) == 0
+
+
+def test_workday_arithmetic_across_years(engine):
+    engine._set_holiday_data({
+        "update_time": Holiday.today().strftime("%Y-%m-%d"),
+        "2026": {
+            "1001": {"day": "20261001", "type": 2},
+            "1002": {"day": "20261002", "type": 2},
+            "1010": {"day": "20261010", "type": 0},  # 周六调休上班
+        },
+        "2027": {"0101": {"day": "20270101", "type": 2}},
+    })
+    start = datetime.datetime(2026, 9, 28)
+    # 9/28-9/30 三天，10/5-10/10 六天（含调休的周六）
+    assert engine.workdays_between(start, datetime.datetime(2026, 10, 11)) == 9
+    assert engine.workdays_between(datetime.datetime(2026, 10, 11), start) == -9
+    assert engine.next_workday(datetime.datetime(2026, 9, 30)) == \
+        datetime.datetime(2026, 10, 5)
+    assert engine.add_workdays(datetime.datetime(2026, 10, 9), 1) == \
+        datetime.datetime(2026, 10, 10)
+    assert engine.add_workdays(datetime.datetime(2026, 10, 5), -1) == \
+        datetime.datetime(2026, 9, 30)
+    # 跨年：12/31 之后的第一个工作日跳过元旦与周末
+    assert engine.next_workday(datetime.date(2026, 12, 31)) == \
+        datetime.date(2027, 1, 4)
+    assert engine.workdays_between(
+        datetime.date(2026, 12, 31), datetime.date(2027, 1, 5)) == 2
+
+
+def test_holiday_runs_give_range_and_adjusted_workdays(engine):
+    engine._set_holiday_data({
+        "update_time": Holiday.today().strftime("%Y-%m-%d"),
+        "2026": {
+            "0927": {"day": "20260927", "type": 0},  # 周日调休上班
+            **{"10{:0>2d}".format(d): {"day": "202610{:0>2d}".format(d), "type": 2}
+               for d in range(1, 8)},
+            "1010": {"day": "20261010", "type": 0},  # 周六调休上班
+        },
+    })
+    start, end = engine._find_holiday_range(datetime.datetime(2026, 10, 3))
+    assert (start, end) == (datetime.datetime(2026, 10, 1),
+                            datetime.datetime(2026, 10, 7))
+    before = engine._find_surrounding_workdays(start, look_back=True)
+    after = engine._find_surrounding_workdays(end, look_back=False)
+    assert [(w["date"].day, w["invert"]) for w in before] == [
+        (27, True), (28, False), (29, False), (30, False)]
+    assert [(w["date"].day, w["invert"]) for w in after][-1] == (10, True)
+    assert len(after) == 3
+    # 超出索引范围时退回逐日查找
+    start, end = engine._find_holiday_range(datetime.datetime(2030, 6, 1))
+    assert (start.day, end.day) == (1, 2)
+
+
+def test_bundled_seed_answers_without_network(
+        data_dir, monkeypatch, freeze_today):
+    monkeypatch.setattr(holiday_engine, "HOLIDAY_SEED_FILE", os.path.join(
+        holiday_engine.DATA_DIR, "holiday_seed.json"))
+    freeze_today(2026, 10, 18)
+    monkeypatch.setattr(holiday_engine.time, "sleep", lambda s: None)
+    calls = []
+
+    def fake_get(session, url, params=None, timeout=None):
+        calls.append(params["d"])
+        return types.SimpleNamespace(status_code=503)
+
+    monkeypatch.setattr(holiday_engine.requests.Session, "get", fake_get)
+    engine = Holiday()
+    # 三个实体的首次更新都走真实的刷新流程：今年已由内置数据覆盖，不联网
+    for _ in range(3):
+        engine.get_holidays_from_server()
+    assert calls == []
+    assert engine.is_holiday_status(datetime.datetime(2026, 2, 16)) == 2
+    assert engine.is_holiday_status(datetime.datetime(2026, 2, 14)) == 0
+    assert engine.is_holiday_status(datetime.datetime(2022, 12, 31)) == 2
+    assert engine.get_day_detail(
+        datetime.datetime(2026, 10, 1))["typename"] == "国庆节"
+
+    # 推迟期过后再联网补齐未来月份与详情
+    freeze_today(2026, 10, 19)
+    engine.get_holidays_from_server()
+    months = ["202610", "202611", "202612", "202701", "202702", "202703"]
+    assert calls == months
+    # 全部获取失败时不推进更新时间，下一次更新继续重试
+    assert "update_time" not in engine._holiday_json
+    engine.get_holidays_from_server()
+    assert calls == months * 2
+
+    # 已有数据的月份以数据为准，其余月份由内置数据补齐
+    engine._set_holiday_data({
+        "2026": {"1001": {"day": "20261001", "type": 2, "typename": "国庆"}},
+    })
+    assert engine.is_holiday_status(datetime.datetime(2026, 10, 10)) == 1
+    assert engine.is_holiday_status(datetime.datetime(2026, 5, 9)) == 0
+    engine.db.close()
+
+
+def test_refresh_skips_seeded_months_with_stored_detail(
+        engine, monkeypatch, freeze_today):
+    engine._seed = holiday_engine.load_seed(
+        os.path.join(holiday_engine.DATA_DIR, "holiday_seed.json"))
+    engine.db.save_full([{"day": "20261001", "type": 2}], "2026-09-01")
+    freeze_today(2026, 10, 18)
+    monkeypatch.setattr(holiday_engine.time, "sleep", lambda s: None)
+    calls = []
+    monkeypatch.setattr(
+        Holiday, "_fetch_month_data",
+        lambda self, year, month, year_dict, full=None: calls.append(
+            (year, month)))
+
+    engine.get_holidays_from_server(days=0)
+    assert calls == [(2026, 11), (2026, 12), (2027, 1), (2027, 2), (2027, 3)]
@@ -0,0 +1,124 @@
+import copy
+import datetime
+import pickle
+
+import pytest
+
+from holiday_engine import Info, JieQi, LunarDate
+
+
+def test_year_offsets_match_year_days():
+    assert len(Info.yearOffsets) == len(Info.yearInfos) + 1
+    assert Info.yearOffsets[0] == 0
+    assert Info.yearOffsets[-1] == sum(Info.yearDays())
+
+
+def test_from_solar_date_known_values():
+    # 2024-02-10 春节
+    ld = LunarDate.fromSolarDate(2024, 2, 10)
+    assert (ld.year, ld.month, ld.day, ld.isLeapMonth) == (2024, 1, 1, False)
+    # 2023 闰二月
+    ld = LunarDate.fromSolarDate(2023, 3, 22)
+    assert (ld.year, ld.month, ld.day, ld.isLeapMonth) == (2023, 2, 1, True)
+    # 起始日
+    ld = LunarDate.fromSolarDate(1900, 1, 31)
+    assert (ld.year, ld.month, ld.day) == (1900, 1, 1)
+
+
+def test_round_trip_across_range():
+    start = LunarDate._startDate
+    for offset in range(0, Info.yearOffsets[-1], 97):
+        solar = start + datetime.timedelta(days=offset)
+        ld = LunarDate.fromSolarDate(solar.year, solar.month, solar.day)
+        assert LunarDate.toSolarDate(
+            ld.year, ld.month, ld.day, ld.isLeapMonth) == solar
+
+
+def test_out_of_range():
+    with pytest.raises(ValueError):
+        LunarDate.fromSolarDate(1900, 1, 30)
+    with pytest.raises(ValueError):
+        LunarDate.toSolarDate(2050, 1, 1)
+
+
+def test_day_table_matches_offset_walk():
+    table = LunarDate._getDayTable()
+    assert len(table) == Info.yearOffsets[-1]
+    for offset in range(0, len(table), 13):
+        a = LunarDate._fromTable(offset)
+        b = LunarDate._fromOffset(offset)
+        assert (a.year, a.month, a.day, a.isLeapMonth) == (
+            b.year, b.month, b.day, b.isLeapMonth)
+
+
+def test_from_solar_range_matches_single_conversion():
+    # 跨越 2023 年闰二月与农历新年
+    start = datetime.date(2022, 12, 1)
+    end = datetime.date(2023, 5, 1)
+    result = LunarDate.fromSolarRange(start, end)
+    assert len(result) == (end - start).days + 1
+    for i, ld in enumerate(result):
+        solar = start + datetime.timedelta(days=i)
+        expected = LunarDate.fromSolarDate(solar.year, solar.month, solar.day)
+        assert (ld.year, ld.month, ld.day, ld.isLeapMonth) == (
+            expected.year, expected.month, expected.day, expected.isLeapMonth)
+
+    assert LunarDate.fromSolarRange(end, start) == []
+
+
+def test_lunar_date_value_semantics():
+    a = LunarDate(2023, 2, 30)
+    leap = LunarDate(2023, 2, 1, True)
+    assert a == LunarDate(2023, 2, 30, False)
+    assert a < leap < LunarDate(2023, 3, 1)
+    assert len({a, LunarDate(2023, 2, 30), leap}) == 2
+    with pytest.raises(AttributeError):
+        a.day = 1
+    assert not hasattr(a, "__dict__")
+
+
+def test_from_solar_date_is_memoized():
+    assert LunarDate.fromSolarDate(2026, 10, 18) is LunarDate.fromSolarDate(
+        2026, 10, 18)
+
+
+@pytest.mark.parametrize(
+    "solar, name",
+    [
+        ((2024, 1, 6), "小寒"),
+        ((2024, 2, 4), "立春"),
+        ((2024, 6, 21), "夏至"),
+        ((2024, 12, 21), "冬至"),
+        ((2025, 2, 3), "立春"),
+        ((2022, 4, 5), "清明"),
+        ((2017, 12, 22), "冬至"),
+    ],
+)
+def test_jieqi_known_dates(solar, name):
+    assert JieQi.fromSolarDate(*solar) == name
+
+
+def test_jieqi_year_table_and_next():
+    terms = JieQi.termsOfYear(2026)
+    assert len(terms) == 24
+    assert [o for o, _ in terms] == sorted(o for o, _ in terms)
+    assert JieQi.fromSolarDate(2026, 10, 18) == ""
+    # 跨年查找
+    assert JieQi.next(datetime.date(2026, 12, 25)) == (
+        datetime.date(2027, 1, 5), "小寒")
+
+
+def test_lunar_date_chinese_fields():
+    ld = LunarDate.fromSolarDate(2024, 11, 16)
+    assert (ld.ganzhiYear(), ld.shengxiao(), ld.toChinese()) == (
+        "甲辰", "龙", "十月十六")
+    assert LunarDate(2023, 2, 1, True).toChinese() == "闰二月初一"
+    assert LunarDate(2025, 12, 30).toChinese() == "腊月三十"
+
+
+def test_lunar_date_copy_and_pickle():
+    leap = LunarDate(2023, 2, 1, True)
+    for clone in (copy.copy(leap), copy.deepcopy(leap),
+                  pickle.loads(pickle.dumps(leap))):
+        assert clone == leap
+        assert clone.isLeapMonth is True
@@ -0,0 +1,126 @@
+import sys
+import os
+import asyncio
+import datetime
+import importlib.util
+import types
+
+import pytest
+
+import holiday_engine
+from holiday_engine import Holiday, HolidayDB
+
+
+# 在共用数据之外再加一条跨年的节假日
+NEXT_NEW_YEAR = {"day": "20270101", "status": 1, "type": 2, "typename": "元旦"}
+
+
+class FakeStore:
+    """替代 homeassistant.helpers.storage.Store，记录合并后的保存内容。"""
+
+    initial = None
+
+    def __init__(self, hass, version, key):
+        self.saved = []
+
+    async def async_load(self):
+        return FakeStore.initial
+
+    def async_delay_save(self, data_func, delay):
+        self.saved.append(data_func())
+
+
+class FakeHass:
+    def __init__(self):
+        self.loop = types.SimpleNamespace(
+            call_soon_threadsafe=lambda func, *args: func(*args))
+
+    async def async_add_executor_job(self, func, *args):
+        return func(*args)
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    """以桩替代 Home Assistant 模块后加载 storage.py。"""
+    ha = types.ModuleType("homeassistant")
+    core = types.ModuleType("homeassistant.core")
+    core.HomeAssistant = FakeHass
+    core.callback = lambda func: func
+    helpers = types.ModuleType("homeassistant.helpers")
+    helpers_storage = types.ModuleType("homeassistant.helpers.storage")
+    helpers_storage.Store = FakeStore
+    package = types.ModuleType("jdm_holiday")
+    package.__path__ = [os.path.dirname(holiday_engine.__file__)]
+    for name, module in (
+        ("homeassistant", ha),
+        ("homeassistant.core", core),
+        ("homeassistant.helpers", helpers),
+        ("homeassistant.helpers.storage", helpers_storage),
+        ("jdm_holiday", package),
+        ("jdm_holiday.holiday_engine", holiday_engine),
+    ):
+        monkeypatch.setitem(sys.modules, name, module)
+    monkeypatch.setattr(FakeStore, "initial", None)
+
+    spec = importlib.util.spec_from_file_location(
+        "jdm_holiday.storage",
+        os.path.join(package.__path__[0], "storage.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_store_imports_existing_sqlite_database(
+        storage, data_dir, monkeypatch, holiday_items):
+    items = holiday_items + [NEXT_NEW_YEAR]
+    db_file = holiday_engine.HOLIDAY_DB_FILE
+    db = HolidayDB(db_file)
+    db.save_full(items, "2026-10-18")
+    db.close()
+    monkeypatch.setattr(storage, "HOLIDAY_DB_FILE", db_file)
+
+    backend = asyncio.run(storage.async_create_store(FakeHass()))
+    assert backend.load_index() == {"update_time": "2026-10-18",
+                                    "years": ["2026", "2027"]}
+    assert backend.get_day_detail("20261001")["suit"] == "祭祀 出行"
+    saved = backend._store.saved[-1]
+    assert saved["update_time"] == "2026-10-18"
+    assert saved["years"]["2026"]["1001"]["typename"] == "国庆节"
+
+    # Store 中已有数据时不再导入
+    FakeStore.initial = saved
+    backend = asyncio.run(storage.async_create_store(FakeHass()))
+    assert backend._store.saved == []
+
+
+def test_store_round_trip_and_queries(storage, data_dir, holiday_items):
+    items = holiday_items + [NEXT_NEW_YEAR]
+    backend = asyncio.run(storage.async_create_store(FakeHass()))
+    counts = backend.save_full(items + [{"day": "bad"}], "2026-10-18")
+    assert counts == {"inserted": 3, "updated": 0, "unchanged": 0}
+    assert backend.save_full(items, "2026-10-19")["unchanged"] == 3
+
+    # 重新加载保存的内容，读取结果与 HolidayDB 形式一致
+    restored = storage.HolidayStore(
+        FakeHass(), FakeStore(None, 1, "k"), backend._store.saved[-1])
+    assert restored.load_index()["update_time"] == "2026-10-19"
+    assert restored.load_year("2026", HolidayDB.SUMMARY_FIELDS)["1001"] == {
+        "day": "20261001", "status": 1, "type": 2, "typename": "国庆节"}
+    assert restored.get_day_detail("20261001")["festival"] == ["国庆节"]
+    assert restored.get_day_detail("20261010")["festival"] == []
+    with pytest.raises(ValueError):
+        restored.load_year("2026", ["type; DROP"])
+
+    days = restored.get_range(datetime.date(2026, 10, 2),
+                              datetime.date(2027, 1, 1), fields=["type"])
+    assert days == [{"day": "20261010", "type": 0},
+                    {"day": "20270101", "type": 2}]
+    assert restored.next_of_type(2, datetime.date(2026, 10, 2))[
+        "typename"] == "元旦"
+    assert restored.next_of_type(2, datetime.date(2027, 1, 2)) == {}
+
+    # 引擎可直接使用 Store 后端
+    engine = Holiday(db=restored)
+    assert engine.is_holiday_status(datetime.datetime(2026, 10, 1)) == 2
+    assert engine.get_day_detail(
+        datetime.datetime(2026, 10, 1))["suit"] == "祭祀 出行"